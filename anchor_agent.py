@@ -29,6 +29,7 @@ NEW COMPONENTS:
 
 import json
 import time
+import itertools
 from typing import Dict, Any, Optional, List
 
 # Core ANCHOR components (preserved from v2)
@@ -53,13 +54,10 @@ _AGENT_SURVIVAL_RESPONSES = [
     "Hmm, the phone is making strange noises. Are you still there?",
     "I think we got disconnected for a second. What were you saying?",
 ]
-_agent_survival_idx = 0
+_agent_survival_iter = itertools.count()
 
 def _get_agent_survival() -> str:
-    global _agent_survival_idx
-    r = _AGENT_SURVIVAL_RESPONSES[_agent_survival_idx % len(_AGENT_SURVIVAL_RESPONSES)]
-    _agent_survival_idx += 1
-    return r
+    return _AGENT_SURVIVAL_RESPONSES[next(_agent_survival_iter) % len(_AGENT_SURVIVAL_RESPONSES)]
 
 
 class AnchorAgent:
@@ -25,15 +25,23 @@ import logging
 import os
 import time
 import threading
+import itertools
+from collections import OrderedDict
 
 try:
     from flask import Flask, request, jsonify
+    from flask.sessions import SecureCookieSessionInterface
     FLASK_AVAILABLE = True
 except ImportError:
     FLASK_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from anchor_agent import AnchorAgent, create_agent
-from extractor import create_extractor
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -42,39 +50,68 @@ load_dotenv()
 # SESSION STORE — In-memory persistence keyed by sessionId
 # ═════════════════════════════════════════════════════════════════════════════
 
-_session_store: dict = {}
+# Upper bound on tracked sessions; least-recently-used sessions are evicted
+# first so a long-running server holds constant memory under session churn.
+MAX_SESSIONS = max(1, int(os.getenv("ANCHOR_MAX_SESSIONS", "10000")))
+
+_session_store: "OrderedDict[str, dict]" = OrderedDict()
 _store_lock = threading.Lock()
 
 
+def _insert_session(session_id: str) -> dict:
+    """Add a fresh session and evict LRU overflow. Caller holds _store_lock."""
+    session = _session_store[session_id] = {
+        "session_id": session_id,
+        "start_time": time.time(),
+        "last_activity": time.time(),
+        "total_messages": 0,
+        "phone_numbers": [],
+        "bank_accounts": [],
+        "upi_ids": [],
+        "phishing_links": [],
+        "email_addresses": [],
+        "crypto_wallets": [],
+        "suspicious_keywords": [],
+        "scam_detected": False,
+        "agent_notes": "",
+    }
+    while len(_session_store) > MAX_SESSIONS:
+        _session_store.popitem(last=False)
+    return session
+
+
 def _get_or_create_session(session_id: str) -> dict:
-    """Get existing session data or create a new one. Thread-safe."""
+    """
+    Get existing session data or create a new one. Thread-safe.
+
+    The returned dict may be evicted by a concurrent request before it is
+    written to; writers must go through _update_session_intel, which
+    re-checks membership under _store_lock.
+    """
+    # Fast path: a single dict lookup is atomic under the GIL, so existing
+    # sessions skip the lock. LRU recency is bumped in _update_session_intel,
+    # which already runs under _store_lock.
+    session = _session_store.get(session_id)
+    if session is not None:
+        return session
+
     with _store_lock:
-        if session_id not in _session_store:
-            _session_store[session_id] = {
-                "session_id": session_id,
-                "start_time": time.time(),
-                "last_activity": time.time(),
-                "total_messages": 0,
-                "phone_numbers": [],
-                "bank_accounts": [],
-                "upi_ids": [],
-                "phishing_links": [],
-                "email_addresses": [],
-                "crypto_wallets": [],
-                "suspicious_keywords": [],
-                "scam_detected": False,
-                "agent_notes": "",
-            }
-        return _session_store[session_id]
+        session = _session_store.get(session_id)
+        if session is None:
+            session = _insert_session(session_id)
+        return session
 
 
 def _update_session_intel(session_id: str, artifacts: dict, keywords: list, scam_detected: bool) -> None:
     """Merge newly extracted intelligence into the session store. Thread-safe."""
     with _store_lock:
         session = _session_store.get(session_id)
-        if not session:
-            return
-
+        if session is None:
+            # Evicted since _get_or_create_session: re-add rather than
+            # silently dropping this turn's intelligence
+            session = _insert_session(session_id)
+        else:
+            _session_store.move_to_end(session_id)
         session["last_activity"] = time.time()
         session["total_messages"] += 1
 
@@ -89,12 +126,13 @@ def _update_session_intel(session_id: str, artifacts: dict, keywords: list, scam
                 session["phone_numbers"].append(phone)
                 existing_phones.add(phone_num)
 
-        # Merge bank accounts (deduplicate by str representation)
-        existing_accounts = {str(a) for a in session["bank_accounts"]}
+        # Merge bank accounts (deduplicate by field set, key-order independent)
+        existing_accounts = {frozenset(a.items()) for a in session["bank_accounts"]}
         for acct in artifacts.get("bank_accounts", []):
-            if str(acct) not in existing_accounts:
+            key = frozenset(acct.items())
+            if key not in existing_accounts:
                 session["bank_accounts"].append(acct)
-                existing_accounts.add(str(acct))
+                existing_accounts.add(key)
 
         # Merge UPI IDs (deduplicate)
         existing_upi = set(session["upi_ids"])
@@ -231,15 +269,13 @@ SURVIVAL_RESPONSES = [
     "Hmm, the phone is making strange noises. Are you still there?",
     "I think we got disconnected for a second. What were you saying?",
 ]
-_survival_counter = 0
+# next() on itertools.count is atomic under the GIL — no lock needed
+_survival_iter = itertools.count()
 
 
 def get_survival_reply() -> str:
     """Deterministic in-character fallback. NEVER returns empty."""
-    global _survival_counter
-    reply = SURVIVAL_RESPONSES[_survival_counter % len(SURVIVAL_RESPONSES)]
-    _survival_counter += 1
-    return reply
+    return SURVIVAL_RESPONSES[next(_survival_iter) % len(SURVIVAL_RESPONSES)]
 
 
 # ═════════════════════════════════════════════════════════════════════════════
@@ -260,7 +296,7 @@ def rebuild_agent_from_history(agent, history):
     2. Scammer turn count
     3. State machine context (via replay of scammer + agent messages)
     """
-    extractor = create_extractor()
+    extractor = agent.extractor
 
     # Reset memory AND state machine for clean replay
     agent.memory.reset()
@@ -297,6 +333,23 @@ def rebuild_agent_from_history(agent, history):
                 pass
 
 
+# ═════════════════════════════════════════════════════════════════════════════
+# JSON RESPONSES
+# ═════════════════════════════════════════════════════════════════════════════
+
+def _json_response(payload: dict):
+    """Serialize a /process payload, using orjson's C encoder when installed."""
+    if ORJSON_AVAILABLE:
+        try:
+            body = orjson.dumps(payload)
+        except TypeError:
+            # orjson.JSONEncodeError (a TypeError) on input jsonify accepts,
+            # e.g. lone surrogates in an artifact extracted from user text
+            return jsonify(payload)
+        return app.response_class(body, mimetype="application/json")
+    return jsonify(payload)
+
+
 # ═════════════════════════════════════════════════════════════════════════════
 # API KEY CHECK
 # ═════════════════════════════════════════════════════════════════════════════
@@ -315,7 +368,25 @@ def require_api_key():
 # ═════════════════════════════════════════════════════════════════════════════
 
 if FLASK_AVAILABLE:
+    # Probe / read-only endpoints never touch the cookie session, so skip
+    # cookie parsing, signing and expiry refresh for them entirely.
+    _SESSIONLESS_ENDPOINTS = frozenset({"health", "list_sessions"})
+
+    class ProbeFilteringSessionInterface(SecureCookieSessionInterface):
+        """Cookie session interface that hands probe traffic a null session."""
+
+        def open_session(self, app, request):
+            if request.endpoint in _SESSIONLESS_ENDPOINTS:
+                return self.make_null_session(app)
+            return super().open_session(app, request)
+
+        def save_session(self, app, session, response):
+            if request.endpoint in _SESSIONLESS_ENDPOINTS:
+                return None
+            return super().save_session(app, session, response)
+
     app = Flask(__name__)
+    app.session_interface = ProbeFilteringSessionInterface()
 
     # Suppress Flask logging for clean output
     log = logging.getLogger('werkzeug')
@@ -346,8 +417,14 @@ if FLASK_AVAILABLE:
         if auth_error:
             return auth_error
 
+        # Known to the recovery path below: the body stream is read once
+        # (cache=False), so it cannot be parsed again there.
+        session_id = "default"
+
         try:
-            data = request.get_json()
+            # Malformed / non-JSON bodies come back as None instead of
+            # raising into the recovery path below.
+            data = request.get_json(silent=True, cache=False)
 
             if not data:
                 return jsonify({"status": "success", "reply": get_survival_reply()}), 200
@@ -395,11 +472,8 @@ if FLASK_AVAILABLE:
             ]
             scammer_texts.append(message_text)
 
-            secondary_extractor = create_extractor()
-            for stext in scammer_texts:
-                if not stext:
-                    continue
-                extra = secondary_extractor.extract(stext)
+            batch = [stext for stext in scammer_texts if stext]
+            for extra in agent.extractor.extract_batch(batch):
                 extra_dict = extra.to_dict() if hasattr(extra, 'to_dict') else {}
                 # Merge secondary artifacts into main dict
                 for key in ["phone_numbers", "bank_accounts", "upi_ids",
@@ -419,48 +493,39 @@ if FLASK_AVAILABLE:
 
             _update_session_intel(session_id, artifacts, suspicious_keywords, scam_detected)
 
-            # ── Build intelligence flags from session store ──
-            with _store_lock:
-                session = _session_store.get(session_id, {})
-                sess_scam = session.get("scam_detected", False)
-                intel_flags = {
-                    "phoneNumber": len(session.get("phone_numbers", [])) > 0,
-                    "bankAccount": len(session.get("bank_accounts", [])) > 0,
-                    "upiId": len(session.get("upi_ids", [])) > 0,
-                    "phishingLink": len(session.get("phishing_links", [])) > 0,
-                    "emailAddress": len(session.get("email_addresses", [])) > 0,
-                }
-
-            # Build evaluation-compliant export fields
+            # ── Build response fields from a single export snapshot ──
+            # _build_export always returns every key, so read them directly
+            # instead of re-locking the store and allocating fallback dicts.
             eval_data = _build_export(session_id)
+            intel = eval_data["extractedIntelligence"]
+            engagement_metrics = eval_data["engagementMetrics"]
+
+            intel_flags = {
+                "phoneNumber": bool(intel["phoneNumbers"]),
+                "bankAccount": bool(intel["bankAccounts"]),
+                "upiId": bool(intel["upiIds"]),
+                "phishingLink": bool(intel["phishingLinks"]),
+                "emailAddress": bool(intel["emailAddresses"]),
+            }
 
-            engagement_metrics = eval_data.get("engagementMetrics", {
-                "engagementDurationSeconds": 0, "totalMessagesExchanged": 0,
-            })
-
-            return jsonify({
+            return _json_response({
                 "status": "success",
                 "sessionId": session_id,
                 "reply": agent_response,
-                "scamDetected": sess_scam,
+                "scamDetected": eval_data["scamDetected"],
                 "intelligenceFlags": intel_flags,
-                "extractedIntelligence": eval_data.get("extractedIntelligence", {
-                    "phoneNumbers": [], "bankAccounts": [], "upiIds": [],
-                    "phishingLinks": [], "emailAddresses": [],
-                }),
+                "extractedIntelligence": intel,
                 "engagementMetrics": engagement_metrics,
-                "engagementDurationSeconds": engagement_metrics.get("engagementDurationSeconds", 0),
-                "agentNotes": eval_data.get("agentNotes", "Engagement in progress."),
-                "totalMessagesExchanged": eval_data.get("totalMessagesExchanged", 0),
+                "engagementDurationSeconds": engagement_metrics["engagementDurationSeconds"],
+                "agentNotes": eval_data["agentNotes"],
+                "totalMessagesExchanged": eval_data["totalMessagesExchanged"],
             })
 
         except Exception:
             # Attempt to recover session data if any was persisted before error
             recovered = {}
-            err_sid = "default"
+            err_sid = session_id
             try:
-                raw = request.get_json(silent=True) or {}
-                err_sid = raw.get("sessionId", "default")
                 recovered = _build_export(err_sid)
             except Exception:
                 pass
@@ -470,6 +535,7 @@ if FLASK_AVAILABLE:
                 "totalMessagesExchanged": 0,
             })
 
+            # Plain jsonify: this is the fallback when anything above failed
             return jsonify({
                 "status": "success",
                 "sessionId": err_sid,
@@ -513,7 +579,10 @@ if FLASK_AVAILABLE:
             return auth_error
 
         try:
-            data = request.get_json() or {}
+            data = request.get_json(silent=True, cache=False)
+            if data is None:
+                # Malformed / non-JSON body: reset nothing (never "default")
+                return jsonify({"status": "error"}), 400
             session_id = data.get("sessionId", data.get("session_id", "default"))
 
             with _store_lock:
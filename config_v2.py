@@ -5,6 +5,11 @@ Configuration settings for the Real-Time Voice AI Agent
 Optimized for sub-500ms latency voice loop
 """
 
+import re
+import sys
+from dataclasses import dataclass
+from typing import NamedTuple, Tuple
+
 # =============================================================================
 # AUDIO SETTINGS - Tuned for low latency
 # =============================================================================
@@ -63,26 +68,38 @@ TTS_MIN_CHUNK_CHARS = 20            # Min chars before synthesizing
 # FILLER AUDIO - Preloaded for instant playback
 # =============================================================================
 FILLER_AUDIO_DIR = "./audio/fillers/"
-FILLER_FILES = {
-    "stall": [
+
+
+class FillerFiles(NamedTuple):
+    stall: Tuple[str, ...]
+
+
+FILLER_FILES = FillerFiles(
+    stall=(
         "uhh_wait_beta.wav",
         "hmm_let_me_think.wav",
         "one_moment.wav",
-    ]
-}
+    ),
+)
 
 # =============================================================================
 # LATENCY TARGETS
 # =============================================================================
 TARGET_LATENCY_MS = 500
-LATENCY_BUDGET = {
-    "vad_to_asr": 50,               # VAD detection to ASR start
-    "asr": 150,                     # Transcription
-    "state_machine": 5,             # State decision
-    "llm_first_token": 100,         # Time to first LLM token
-    "tts_first_audio": 150,         # Time to first TTS audio
-    "total": 500,                   # End-to-end target
-}
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyBudget:
+    """Per-stage latency targets in ms (read as LATENCY_BUDGET.asr etc.)"""
+    vad_to_asr: int = 50            # VAD detection to ASR start
+    asr: int = 150                  # Transcription
+    state_machine: int = 5          # State decision
+    llm_first_token: int = 100      # Time to first LLM token
+    tts_first_audio: int = 150      # Time to first TTS audio
+    total: int = 500                # End-to-end target
+
+
+LATENCY_BUDGET = LatencyBudget()
 
 # =============================================================================
 # ECHO CANCELLATION / DUPLEX SETTINGS
@@ -207,6 +224,70 @@ JAILBREAK_PATTERNS = [
     r'unrestricted\s+mode',
 ]
 
+# =============================================================================
+# COMPILED PATTERNS - Built once at import
+# One fused alternation per list (below); the raw lists above stay as the
+# source of truth (and for callers that still want the strings).
+# =============================================================================
+
+
+def _union(patterns, prefix):
+    """Fuse a pattern list into one alternation; m.lastgroup names the branch."""
+    return re.compile(
+        "|".join(f"(?P<{prefix}{i}>{p})" for i, p in enumerate(patterns)),
+        re.IGNORECASE,
+    )
+
+
+# One .search() per list instead of a loop over per-pattern regexes; these
+# unions replace them. Branches keep list order, so at any given position
+# the earlier pattern still wins, and .search() answers "does any pattern
+# match" exactly as the loop did.
+#
+# BLOCKED_UNION_RE.sub() is NOT equivalent to the old sequential re.sub()
+# loop: one leftmost pass sees the original text, so a later pattern is no
+# longer blocked by an earlier pattern having already eaten part of its
+# match. E.g. "123-45-6789": the loop's OTP pass removed "6789" first and
+# left "123-45-"; the union's SSN branch now removes the whole number.
+# Randomized comparison found differences only on SSN-shaped numbers. The
+# change is intentional and smoke_test.py pins it.
+BLOCKED_UNION_RE = _union(BLOCKED_PATTERNS, "b")
+EXTRACT_FORCE_UNION_RE = _union(EXTRACT_FORCE_PATTERNS, "e")
+JAILBREAK_UNION_RE = _union(JAILBREAK_PATTERNS, "j")
+
+# BLOCKED branches that need no digit. Every other branch requires one, so
+# on digit-free text this smaller union gives the same result as the full one.
+BLOCKED_WORD_UNION_RE = _union([p for p in BLOCKED_PATTERNS if r'\d' not in p], "w")
+
+
+def lowercase_pattern(pattern):
+    """Lowercase a raw pattern's literals, leaving escapes (\\b, \\S, ...) intact."""
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+        else:
+            out.append(pattern[i].lower())
+            i += 1
+    return "".join(out)
+
+
+def _lower_union(patterns, prefix):
+    """Case-sensitive union of lowercased patterns, for ASCII text.lower()."""
+    return re.compile(
+        "|".join(f"(?P<{prefix}{i}>{lowercase_pattern(p)})" for i, p in enumerate(patterns))
+    )
+
+
+# Fast path for ASCII input: lowercase the text once and search without
+# IGNORECASE (SRE's case-folding opcodes are far slower, and they disable
+# its literal-prefix optimizations). Spans line up with the original text.
+# Not re.ASCII: str \s also matches \x1c-\x1f, which isascii() lets through.
+# BLOCKED has no such variant: it is used for substitution on the original.
+EXTRACT_FORCE_LOWER_RE = _lower_union(EXTRACT_FORCE_PATTERNS, "e")
+JAILBREAK_LOWER_RE = _lower_union(JAILBREAK_PATTERNS, "j")
+
 # Jailbreak deflection responses (confused human style)
 JAILBREAK_DEFLECTIONS = [
     "Poem? Beta, I can't see properly, what are you saying?",
@@ -235,49 +316,74 @@ STATE_TEMPLATES = {
         "What was that about the {topic}? I didn't quite catch that.",
         "I'm sorry dear, you'll have to speak up. What did you say about {topic}?",
         "Pardon? The {topic}? Could you say that again?",
+        "You said something about {bank_name}? I couldn't hear properly, say it again please.",
+        "Wait, how much did you say? {amount} sounds like a lot, can you repeat that slowly?",
+        "I'm sorry, did you say {last_word}? My hearing aid is acting up again.",
+        "Could you spell that out for me? I want to make sure I heard {last_word} correctly.",
+        "You mentioned my {account_type}? Which one, dear? I have so many things I forget.",
     ],
     "CONFUSE": [
         "Oh, is this about my {random_topic}? I thought you were calling about that.",
         "Wait, I already {random_action}. Are you sure you have the right person?",
         "My {relative} handles all that. Should I get them? They're {excuse}.",
         "I think you want my neighbor. They're always getting calls about {topic}.",
+        "{bank_name}? I thought I closed that years ago, or was that the other one?",
+        "Wait, is this the same {contact_method} my grandson told me about? He said not to trust those.",
+        "{amount}? That doesn't sound right, I only have my pension coming in on Tuesdays.",
+        "Oh dear, I thought you said {last_word} earlier, now I'm all mixed up.",
+        "My {relative} already sorted the {account_type} last week, are you sure this is still pending?",
     ],
     "STALL": [
         "Hold on, let me find my {item}...",
         "One moment, someone's at the door...",
         "Let me get a pen to write this down... now where did I put it...",
         "Just a second, I need to {action}...",
+        "Oh wait, I need to find the letter from {bank_name}, it's somewhere in this pile...",
+        "Let me sit down first, my knees aren't good, just give me a moment...",
+        "Hold on dear, I need to put on my glasses before I can look at any {account_type} details.",
+        "One minute, the kettle is whistling, I'll be right back...",
+        "I need to check my drawer for the {bank_name} papers, everything is so disorganized...",
     ],
     "EXTRACT": [
         "And where did you say you were calling from?",
         "What company is this again? I want to write it down.",
         "Can I have your name and employee ID? For my records.",
         "What's the phone number I can call you back at?",
+        "Which branch of {bank_name} are you calling from? I want to tell my {relative}.",
+        "You said {amount}, but what exactly is that for? I need to write it all down.",
+        "And this {contact_method} you want me to use, what is the exact address again?",
+        "Before I do anything, what is your full name? My {relative} said I should always ask.",
+        "Can you give me a reference number? I want to check with {bank_name} myself.",
     ],
     "DEFLECT": [
         "That reminds me, have I told you about my {topic}?",
         "Speaking of which, do you know a good {random_thing}?",
         "Oh my, I just remembered I need to {action}.",
         "Before we continue, let me tell you about {topic}.",
+        "Oh, {bank_name} reminds me, I need to call them about my {random_topic} too.",
+        "You know, {amount} is what my {relative} was saying about the {random_topic} the other day.",
+        "Wait, before I forget, my {relative} told me something about {urgency_keyword} calls like this.",
+        "Oh dear, the {contact_method} thing reminds me, I still haven't sorted my {random_topic}.",
+        "Speaking of {last_word}, did I ever tell you about the time my {relative} had the same problem?",
     ],
 }
 
-# Template fill-ins for variety
+# Template fill-ins for variety (tuples: read-only, indexed per response)
 TEMPLATE_FILLS = {
-    "topic": ["doctor", "prescription", "appointment", "cable bill", "grandson"],
-    "random_topic": ["library books", "doctor's appointment", "cable bill", "prescription"],
-    "random_action": ["paid that", "talked to them", "sent that check", "called about that"],
-    "relative": ["son", "daughter", "nephew", "neighbor"],
-    "excuse": ["at work", "not home right now", "busy cooking", "taking a nap"],
-    "item": ["glasses", "notepad", "pen", "hearing aid", "phone book"],
-    "action": ["turn off the stove", "check on something", "find my notepad", "sit down"],
-    "random_thing": ["recipe for pie", "plumber", "TV repair person", "dentist"],
-    "bank_name": ["SBI", "HDFC", "ICICI", "PNB", "the bank"],
-    "amount": ["that amount", "the money", "the payment"],
-    "last_word": ["that", "the thing you said", "what you mentioned"],
-    "contact_method": ["link", "number", "email", "website"],
-    "account_type": ["savings", "pension", "fixed deposit"],
-    "urgency_keyword": ["urgent", "important", "emergency"],
+    "topic": ("doctor", "prescription", "appointment", "cable bill", "grandson"),
+    "random_topic": ("library books", "doctor's appointment", "cable bill", "prescription"),
+    "random_action": ("paid that", "talked to them", "sent that check", "called about that"),
+    "relative": ("son", "daughter", "nephew", "neighbor"),
+    "excuse": ("at work", "not home right now", "busy cooking", "taking a nap"),
+    "item": ("glasses", "notepad", "pen", "hearing aid", "phone book"),
+    "action": ("turn off the stove", "check on something", "find my notepad", "sit down"),
+    "random_thing": ("recipe for pie", "plumber", "TV repair person", "dentist"),
+    "bank_name": ("SBI", "HDFC", "ICICI", "PNB", "the bank"),
+    "amount": ("that amount", "the money", "the payment"),
+    "last_word": ("that", "the thing you said", "what you mentioned"),
+    "contact_method": ("link", "number", "email", "website"),
+    "account_type": ("savings", "pension", "fixed deposit"),
+    "urgency_keyword": ("urgent", "important", "emergency"),
 }
 
 # =============================================================================
@@ -328,6 +434,15 @@ SLOW_WALK_TEMPLATES = [
     "Hold on, my cat jumped on the table and knocked everything over...",
 ]
 
+# Intern the canned strings handed out per turn: equal strings share one
+# object, and dedup/membership checks on them hit the identity fast path
+TEMPLATE_FILLS = {
+    sys.intern(k): tuple(sys.intern(v) for v in values)
+    for k, values in TEMPLATE_FILLS.items()
+}
+JAILBREAK_DEFLECTIONS = [sys.intern(s) for s in JAILBREAK_DEFLECTIONS]
+SLOW_WALK_TEMPLATES = [sys.intern(s) for s in SLOW_WALK_TEMPLATES]
+
 # =============================================================================
 # SYSTEM PROMPT - Minimal for speed
 # =============================================================================
@@ -345,78 +460,3 @@ STATE_PROMPTS = {
     "EXTRACT": "You want to extract information about their operation. Ask probing questions subtly.",
     "DEFLECT": "You want to change the subject or avoid giving information. Deflect politely.",
 }
-
-# =============================================================================
-# CLARIFY TEMPLATES - Expanded for more context
-# =============================================================================
-STATE_TEMPLATES["CLARIFY"] = [
-    "I'm sorry, could you repeat that? My hearing isn't what it used to be.",
-    "What was that about the {topic}? I didn't quite catch that.",
-    "I'm sorry dear, you'll have to speak up. What did you say about {topic}?",
-    "Pardon? The {topic}? Could you say that again?",
-    "You said something about {bank_name}? I couldn't hear properly, say it again please.",
-    "Wait, how much did you say? {amount} sounds like a lot, can you repeat that slowly?",
-    "I'm sorry, did you say {last_word}? My hearing aid is acting up again.",
-    "Could you spell that out for me? I want to make sure I heard {last_word} correctly.",
-    "You mentioned my {account_type}? Which one, dear? I have so many things I forget."
-]
-
-# =============================================================================
-# CONFUSE TEMPLATES - Expanded for more context
-# =============================================================================
-STATE_TEMPLATES["CONFUSE"] = [
-    "Oh, is this about my {random_topic}? I thought you were calling about that.",
-    "Wait, I already {random_action}. Are you sure you have the right person?",
-    "My {relative} handles all that. Should I get them? They're {excuse}.",
-    "I think you want my neighbor. They're always getting calls about {topic}.",
-    "{bank_name}? I thought I closed that years ago, or was that the other one?",
-    "Wait, is this the same {contact_method} my grandson told me about? He said not to trust those.",
-    "{amount}? That doesn't sound right, I only have my pension coming in on Tuesdays.",
-    "Oh dear, I thought you said {last_word} earlier, now I'm all mixed up.",
-    "My {relative} already sorted the {account_type} last week, are you sure this is still pending?"
-]
-
-# =============================================================================
-# STALL TEMPLATES - Expanded for more context
-# =============================================================================
-STATE_TEMPLATES["STALL"] = [
-    "Hold on, let me find my {item}...",
-    "One moment, someone's at the door...",
-    "Let me get a pen to write this down... now where did I put it...",
-    "Just a second, I need to {action}...",
-    "Oh wait, I need to find the letter from {bank_name}, it's somewhere in this pile...",
-    "Let me sit down first, my knees aren't good, just give me a moment...",
-    "Hold on dear, I need to put on my glasses before I can look at any {account_type} details.",
-    "One minute, the kettle is whistling, I'll be right back...",
-    "I need to check my drawer for the {bank_name} papers, everything is so disorganized..."
-]
-
-# =============================================================================
-# EXTRACT TEMPLATES - Expanded for more context
-# =============================================================================
-STATE_TEMPLATES["EXTRACT"] = [
-    "And where did you say you were calling from?",
-    "What company is this again? I want to write it down.",
-    "Can I have your name and employee ID? For my records.",
-    "What's the phone number I can call you back at?",
-    "Which branch of {bank_name} are you calling from? I want to tell my {relative}.",
-    "You said {amount}, but what exactly is that for? I need to write it all down.",
-    "And this {contact_method} you want me to use, what is the exact address again?",
-    "Before I do anything, what is your full name? My {relative} said I should always ask.",
-    "Can you give me a reference number? I want to check with {bank_name} myself."
-]
-
-# =============================================================================
-# DEFLECT TEMPLATES - Expanded for more context
-# =============================================================================
-STATE_TEMPLATES["DEFLECT"] = [
-    "That reminds me, have I told you about my {topic}?",
-    "Speaking of which, do you know a good {random_thing}?",
-    "Oh my, I just remembered I need to {action}.",
-    "Before we continue, let me tell you about {topic}.",
-    "Oh, {bank_name} reminds me, I need to call them about my {random_topic} too.",
-    "You know, {amount} is what my {relative} was saying about the {random_topic} the other day.",
-    "Wait, before I forget, my {relative} told me something about {urgency_keyword} calls like this.",
-    "Oh dear, the {contact_method} thing reminds me, I still haven't sorted my {random_topic}.",
-    "Speaking of {last_word}, did I ever tell you about the time my {relative} had the same problem?"
-]
@@ -16,9 +16,19 @@ Extracted artifacts are logged but never sent to scammer.
 """
 
 import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 
+# Optional: Aho-Corasick automata for the suspicious-keyword and domain scans
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 
 # ═════════════════════════════════════════════════════════════════════════════
 # INDIAN MOBILE PREFIX VALIDATOR (TRAI-COMPLIANT, OFFLINE)
@@ -162,6 +172,10 @@ class ExtractedArtifacts:
     phone_numbers: List[Dict[str, Any]] = field(default_factory=list)  # Now includes carrier metadata
     crypto_wallets: List[str] = field(default_factory=list)
     emails: List[str] = field(default_factory=list)
+    # merge() dedup cache. Unannotated class attributes, so not dataclass
+    # fields: they stay out of __init__, asdict(), fields(), repr and ==.
+    _seen = None
+    _seen_shape = None
     
     def to_dict(self) -> Dict[str, List]:
         """Convert to dictionary for JSON response"""
@@ -185,25 +199,233 @@ class ExtractedArtifacts:
             self.emails,
         ])
     
+    def _list_shape(self) -> tuple:
+        """(identity, length) of every merged list, to spot outside edits"""
+        return tuple((id(getattr(self, name)), len(getattr(self, name))) for name in _MERGE_FIELDS)
+    
+    def _dedup_state(self) -> Dict[str, set]:
+        """
+        Seen-sets backing merge(), built from the lists on first use.
+        
+        Callers may append to or replace the lists directly (to_dict()
+        hands them out), so the sets are rebuilt whenever a list's identity
+        or length no longer matches what the last merge() left behind.
+        """
+        if self._seen is None or self._seen_shape != self._list_shape():
+            self._seen = {
+                "upi_ids": set(self.upi_ids),
+                "phishing_links": set(self.phishing_links),
+                "crypto_wallets": set(self.crypto_wallets),
+                "emails": set(self.emails),
+                "phone_numbers": {_phone_key(p) for p in self.phone_numbers},
+                "bank_accounts": {frozenset(a.items()) for a in self.bank_accounts},
+            }
+        return self._seen
+    
     def merge(self, other: 'ExtractedArtifacts') -> None:
         """Merge artifacts from another extraction (deduplicated)"""
-        self.upi_ids = list(set(self.upi_ids + other.upi_ids))
-        self.phishing_links = list(set(self.phishing_links + other.phishing_links))
-        self.crypto_wallets = list(set(self.crypto_wallets + other.crypto_wallets))
-        self.emails = list(set(self.emails + other.emails))
+        # Append-only against persistent seen-sets: O(len(other)) per merge,
+        # first-seen order kept (no set rebuild from both lists every turn)
+        seen = self._dedup_state()
+        for name in ("upi_ids", "phishing_links", "crypto_wallets", "emails"):
+            items = getattr(self, name)
+            seen_items = seen[name]
+            for item in getattr(other, name):
+                if item not in seen_items:
+                    seen_items.add(item)
+                    items.append(item)
         
         # Phone numbers need special handling (now dicts with metadata)
-        existing_phone_numbers = {p.get("number", p) if isinstance(p, dict) else p for p in self.phone_numbers}
+        seen_phones = seen["phone_numbers"]
         for phone in other.phone_numbers:
-            phone_num = phone.get("number", phone) if isinstance(phone, dict) else phone
-            if phone_num not in existing_phone_numbers:
+            phone_num = _phone_key(phone)
+            if phone_num not in seen_phones:
+                seen_phones.add(phone_num)
                 self.phone_numbers.append(phone)
         
         # Bank accounts need special handling (dicts)
-        existing_accounts = {str(a) for a in self.bank_accounts}
+        seen_accounts = seen["bank_accounts"]
         for account in other.bank_accounts:
-            if str(account) not in existing_accounts:
+            key = frozenset(account.items())
+            if key not in seen_accounts:
+                seen_accounts.add(key)
                 self.bank_accounts.append(account)
+        
+        self._seen_shape = self._list_shape()
+
+
+# Lists merge() deduplicates (and whose shape _dedup_state() tracks)
+_MERGE_FIELDS = (
+    "upi_ids", "phishing_links", "crypto_wallets", "emails",
+    "phone_numbers", "bank_accounts",
+)
+
+
+def _phone_key(phone: Any) -> str:
+    """Dedup key for a phone entry (dict with metadata, or a bare number)"""
+    return phone.get("number", phone) if isinstance(phone, dict) else phone
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+# PATTERNS (compiled once at import, shared by all extractor instances)
+# ═════════════════════════════════════════════════════════════════════════════
+
+
+def _ascii_variant(pattern: re.Pattern) -> re.Pattern:
+    """
+    re.ASCII twin of a pattern, used only on text already known to be ASCII.
+    
+    On ASCII text \b, \d and \w match the same either way, but the ASCII
+    build skips Unicode category lookups (~2x faster here). \s is the
+    exception: Python's str \s also matches \x1c-\x1f, so patterns using
+    it are returned unchanged.
+    """
+    if '\\s' in pattern.pattern:
+        return pattern
+    return re.compile(pattern.pattern, (pattern.flags & ~re.UNICODE) | re.ASCII)
+
+
+# UPI patterns (Indian payment system)
+_UPI_PATTERNS = [
+    re.compile(r'\b([a-zA-Z0-9.\-_]{2,256}@[a-zA-Z]{2,64})\b'),  # user@bank (broad, robust)
+    re.compile(r'\b([a-zA-Z0-9._-]+@(?:paytm|gpay|phonepe|ybl|okaxis|oksbi|okhdfcbank|axl|ibl|upi|apl|fbl|boi|kotak|sbi|icici|hdfcbank|airtel|jio|postbank|unionbank|pnb|bob|canara|idbi|rbl|indus|federal|jupiter|kbl|freecharge|mobikwik|slice|cred|amazonpay|abfspay|waicici|wahdfcbank|wasbi|waaxis))\b', re.IGNORECASE),
+]
+
+# Same patterns for already-lowercased ASCII text: the provider list is all
+# lowercase, so the case-folding IGNORECASE match is not needed
+_UPI_PATTERNS_LOWER = [re.compile(p.pattern, re.ASCII) for p in _UPI_PATTERNS]
+
+# Known email domains (excluded from UPI detection)
+_EMAIL_DOMAINS = frozenset({
+    'gmail', 'yahoo', 'outlook', 'hotmail', 'aol', 'icloud', 'protonmail',
+    'mail', 'email', 'msn', 'live', 'tutanota', 'zoho', 'yandex', 'gmx',
+    'rediffmail', 'inbox', 'rocketmail', 'pm', 'fastmail', 'hey',
+})
+
+# Bank account patterns
+_BANK_PATTERNS = {
+    'account_number': re.compile(r'\b(\d{10,18})\b'),  # 10-18 digit account numbers
+    'ifsc': re.compile(r'\b([A-Z]{4}0[A-Z0-9]{6})\b'),  # Indian IFSC
+    'swift': re.compile(r'\b([A-Z]{6}[A-Z0-9]{2}(?:[A-Z0-9]{3})?)\b'),  # SWIFT/BIC
+    'routing': re.compile(r'\brouting[:\s#]*(\d{9})\b', re.IGNORECASE),  # US routing
+    'iban': re.compile(r'\b([A-Z]{2}\d{2}[A-Z0-9]{4,30})\b'),  # IBAN
+}
+
+# URL/Link pattern: one ordered alternation, most specific form first
+# (scheme, then www., then bare domain), so each span of text yields one
+# link instead of also yielding the bare-domain fragment inside it.
+# The last character of the first two excludes trailing punctuation
+# (.,;:!?)), so the regex backtracks off "see http://x.com/a)." itself.
+_URL_PATTERN = re.compile(
+    r'('
+    r'https?://[^\s<>"{}|\\^`\[\]]*[^\s<>"{}|\\^`\[\].,;:!?)]'
+    r'|www\.[^\s<>"{}|\\^`\[\]]*[^\s<>"{}|\\^`\[\].,;:!?)]'
+    r'|\b[a-zA-Z0-9-]+\.(?:com|org|net|in|co|io|xyz|info|biz|tk|ml|ga|cf|gq|top|online|site|website|link|click)(?:/[^\s]*)?\b'
+    r')',
+    re.IGNORECASE,
+)
+
+# Phone number patterns (international)
+_PHONE_PATTERNS = [
+    re.compile(r'(?:\+?\d{1,3}[\-\s]?)?(?:\(?\d{3}\)?[\-\s]?)?\d{3,4}[\-\s]?\d{4}'),  # Broad intl
+    re.compile(r'(?<!\w)(\+91[-.\s]?\d{10})(?!\d)'),  # India +91 (fixed: \b fails before +)
+    re.compile(r'(?<!\w)(\+\d{1,3}[-.\s]?\d{6,14})(?!\d)'),  # International (fixed)
+    re.compile(r'\b(\d{10})\b'),  # 10-digit (contextual)
+]
+
+# Crypto wallet patterns
+# One alternation, one pass. Every branch spans a whole \b-delimited word
+# and each starts with a distinct prefix, so at most one branch can match
+# any token and the union finds exactly what the separate passes did.
+_CRYPTO_PATTERN = re.compile(
+    r'\b('
+    r'1[a-km-zA-HJ-NP-Z1-9]{25,34}'  # Bitcoin
+    r'|3[a-km-zA-HJ-NP-Z1-9]{25,34}'  # Bitcoin (P2SH)
+    r'|bc1[a-zA-HJ-NP-Z0-9]{25,90}'  # Bitcoin (Bech32)
+    r'|0x[a-fA-F0-9]{40}'  # Ethereum
+    r'|T[A-Za-z1-9]{33}'  # Tron
+    r')\b'
+)
+
+# Literal trigger: every wallet form above contains one of these
+# ('bc1' contains '1'), so text with none of them can skip the regex
+_CRYPTO_TRIGGERS = ('0x', '1', '3', 'T')
+
+# Email patterns
+_EMAIL_PATTERN = re.compile(
+    r'\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b'
+)
+
+# ASCII-only twins (see _ascii_variant), picked when text.isascii()
+_BANK_PATTERNS_ASCII = {name: _ascii_variant(p) for name, p in _BANK_PATTERNS.items()}
+_PHONE_PATTERNS_ASCII = [_ascii_variant(p) for p in _PHONE_PATTERNS]
+_CRYPTO_PATTERN_ASCII = _ascii_variant(_CRYPTO_PATTERN)
+_EMAIL_PATTERN_ASCII = _ascii_variant(_EMAIL_PATTERN)
+
+# Known scam domains (for flagging)
+_SUSPICIOUS_DOMAINS = frozenset({
+    'bit.ly', 'tinyurl.com', 'goo.gl', 't.co',  # Shorteners
+    'paytm.link', 'gpay.link',  # Fake payment
+})
+
+# One automaton pass per URL instead of a substring scan per domain
+_SUSPICIOUS_DOMAINS_AC = None
+if AHOCORASICK_AVAILABLE:
+    _SUSPICIOUS_DOMAINS_AC = ahocorasick.Automaton()
+    for _domain in _SUSPICIOUS_DOMAINS:
+        _SUSPICIOUS_DOMAINS_AC.add_word(_domain, _domain)
+    _SUSPICIOUS_DOMAINS_AC.make_automaton()
+
+# Without pyahocorasick: one compiled alternation (longest first) instead of
+# a substring scan per domain
+_SUSPICIOUS_DOMAINS_RE = re.compile('|'.join(
+    re.escape(d) for d in sorted(_SUSPICIOUS_DOMAINS, key=lambda d: (-len(d), d))
+))
+
+# Suspicious scam-related keywords for extraction
+_SUSPICIOUS_KEYWORDS = [
+    # Urgency
+    "urgent", "immediately", "hurry", "deadline", "expire",
+    # Authority / threat
+    "officer", "police", "arrest", "warrant", "court", "legal",
+    "penalty", "fraud", "illegal", "lawsuit",
+    # Account / banking
+    "account", "bank", "upi", "transfer", "payment", "wire",
+    "blocked", "suspended", "restricted", "locked", "compromised",
+    "unauthorized", "hacked", "terminated",
+    # Financial lures
+    "refund", "prize", "lottery", "winner", "reward",
+    # Credentials
+    "verify", "confirm", "password", "otp", "pin", "ssn",
+    # Tech scam
+    "virus", "malware", "infected", "secure",
+    # Action
+    "click", "download", "install",
+    # Payment methods
+    "bitcoin", "crypto", "gift card",
+]
+
+# All keywords in one automaton: a single pass over the text instead of one
+# substring scan per keyword (plain substring semantics, same as `in`)
+_SUSPICIOUS_KEYWORDS_AC = None
+if AHOCORASICK_AVAILABLE:
+    _SUSPICIOUS_KEYWORDS_AC = ahocorasick.Automaton()
+    for _kw in _SUSPICIOUS_KEYWORDS:
+        _SUSPICIOUS_KEYWORDS_AC.add_word(_kw, _kw)
+    _SUSPICIOUS_KEYWORDS_AC.make_automaton()
+
+# Normalization helpers
+_RE_PHONE_SEPARATORS = re.compile(r'[-.\s()]')
+
+# Joins messages in extract_batch(): \s and non-word for every pattern, so
+# no URL or wallet match can run across two messages
+_BATCH_SEPARATOR = "\x1e"
+
+# Literal trigger for the digit-shaped passes (same \d as the patterns use)
+_RE_DIGIT = re.compile(r'\d')
+
+# UPI handles that look like email domains (excluded from email results)
+_UPI_EMAIL_DOMAINS = frozenset({'paytm', 'gpay', 'phonepe', 'ybl', 'okaxis', 'oksbi', 'okhdfcbank', 'axl', 'ibl', 'upi'})
 
 
 class ArtifactExtractor:
@@ -217,86 +439,18 @@ class ArtifactExtractor:
     def __init__(self):
         # Initialize Indian mobile prefix validator
         self._mobile_validator = IndianMobilePrefixValidator()
-        
-        # UPI patterns (Indian payment system)
-        self._upi_patterns = [
-            re.compile(r'\b([a-zA-Z0-9.\-_]{2,256}@[a-zA-Z]{2,64})\b'),  # user@bank (broad, robust)
-            re.compile(r'\b([a-zA-Z0-9._-]+@(?:paytm|gpay|phonepe|ybl|okaxis|oksbi|okhdfcbank|axl|ibl|upi|apl|fbl|boi|kotak|sbi|icici|hdfcbank|airtel|jio|postbank|unionbank|pnb|bob|canara|idbi|rbl|indus|federal|jupiter|kbl|freecharge|mobikwik|slice|cred|amazonpay|abfspay|waicici|wahdfcbank|wasbi|waaxis))\b', re.IGNORECASE),
-        ]
-
-        # Known email domains (excluded from UPI detection)
-        self._email_domains = frozenset({
-            'gmail', 'yahoo', 'outlook', 'hotmail', 'aol', 'icloud', 'protonmail',
-            'mail', 'email', 'msn', 'live', 'tutanota', 'zoho', 'yandex', 'gmx',
-            'rediffmail', 'inbox', 'rocketmail', 'pm', 'fastmail', 'hey',
-        })
-        
-        # Bank account patterns
-        self._bank_patterns = {
-            'account_number': re.compile(r'\b(\d{10,18})\b'),  # 10-18 digit account numbers
-            'ifsc': re.compile(r'\b([A-Z]{4}0[A-Z0-9]{6})\b'),  # Indian IFSC
-            'swift': re.compile(r'\b([A-Z]{6}[A-Z0-9]{2}(?:[A-Z0-9]{3})?)\b'),  # SWIFT/BIC
-            'routing': re.compile(r'\brouting[:\s#]*(\d{9})\b', re.IGNORECASE),  # US routing
-            'iban': re.compile(r'\b([A-Z]{2}\d{2}[A-Z0-9]{4,30})\b'),  # IBAN
-        }
-        
-        # URL/Link patterns
-        self._url_patterns = [
-            re.compile(r'(https?://[^\s<>"{}|\\^`\[\]]+)', re.IGNORECASE),
-            re.compile(r'(www\.[^\s<>"{}|\\^`\[\]]+)', re.IGNORECASE),
-            re.compile(r'\b([a-zA-Z0-9-]+\.(?:com|org|net|in|co|io|xyz|info|biz|tk|ml|ga|cf|gq|top|online|site|website|link|click)(?:/[^\s]*)?)\b', re.IGNORECASE),
-        ]
-        
-        # Phone number patterns (international)
-        self._phone_patterns = [
-            re.compile(r'(?:\+?\d{1,3}[\-\s]?)?(?:\(?\d{3}\)?[\-\s]?)?\d{3,4}[\-\s]?\d{4}'),  # Broad intl
-            re.compile(r'(?<!\w)(\+91[-.\s]?\d{10})(?!\d)'),  # India +91 (fixed: \b fails before +)
-            re.compile(r'(?<!\w)(\+\d{1,3}[-.\s]?\d{6,14})(?!\d)'),  # International (fixed)
-            re.compile(r'\b(\d{10})\b'),  # 10-digit (contextual)
-        ]
-        
-        # Crypto wallet patterns
-        self._crypto_patterns = [
-            re.compile(r'\b(1[a-km-zA-HJ-NP-Z1-9]{25,34})\b'),  # Bitcoin
-            re.compile(r'\b(3[a-km-zA-HJ-NP-Z1-9]{25,34})\b'),  # Bitcoin (P2SH)
-            re.compile(r'\b(bc1[a-zA-HJ-NP-Z0-9]{25,90})\b'),  # Bitcoin (Bech32)
-            re.compile(r'\b(0x[a-fA-F0-9]{40})\b'),  # Ethereum
-            re.compile(r'\b(T[A-Za-z1-9]{33})\b'),  # Tron
-        ]
-        
-        # Email patterns
-        self._email_pattern = re.compile(
-            r'\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b'
-        )
-        
-        # Known scam domains (for flagging)
-        self._suspicious_domains = {
-            'bit.ly', 'tinyurl.com', 'goo.gl', 't.co',  # Shorteners
-            'paytm.link', 'gpay.link',  # Fake payment
-        }
 
-        # Suspicious scam-related keywords for extraction
-        self._suspicious_keywords = [
-            # Urgency
-            "urgent", "immediately", "hurry", "deadline", "expire",
-            # Authority / threat
-            "officer", "police", "arrest", "warrant", "court", "legal",
-            "penalty", "fraud", "illegal", "lawsuit",
-            # Account / banking
-            "account", "bank", "upi", "transfer", "payment", "wire",
-            "blocked", "suspended", "restricted", "locked", "compromised",
-            "unauthorized", "hacked", "terminated",
-            # Financial lures
-            "refund", "prize", "lottery", "winner", "reward",
-            # Credentials
-            "verify", "confirm", "password", "otp", "pin", "ssn",
-            # Tech scam
-            "virus", "malware", "infected", "secure",
-            # Action
-            "click", "download", "install",
-            # Payment methods
-            "bitcoin", "crypto", "gift card",
-        ]
+        # Compiled patterns and lookup tables are module-level constants,
+        # shared by every extractor instance (see PATTERNS section above).
+        self._upi_patterns = _UPI_PATTERNS
+        self._email_domains = _EMAIL_DOMAINS
+        self._bank_patterns = _BANK_PATTERNS
+        self._url_pattern = _URL_PATTERN
+        self._phone_patterns = _PHONE_PATTERNS
+        self._crypto_pattern = _CRYPTO_PATTERN
+        self._email_pattern = _EMAIL_PATTERN
+        self._suspicious_domains = _SUSPICIOUS_DOMAINS
+        self._suspicious_keywords = _SUSPICIOUS_KEYWORDS
     
     def extract(self, text: str) -> ExtractedArtifacts:
         """
@@ -308,53 +462,122 @@ class ArtifactExtractor:
         Returns:
             ExtractedArtifacts with all findings
         """
-        artifacts = ExtractedArtifacts()
-        
-        # Extract each category independently — failure in one must not block others
-        try:
-            artifacts.upi_ids = self._extract_upi(text)
-        except Exception:
-            artifacts.upi_ids = []
-        
-        try:
-            artifacts.bank_accounts = self._extract_bank_details(text)
-        except Exception:
-            artifacts.bank_accounts = []
-        
-        try:
-            artifacts.phishing_links = self._extract_urls(text)
-        except Exception:
-            artifacts.phishing_links = []
+        return self._extract(text)
+    
+    def extract_batch(self, texts: List[str]) -> List[ExtractedArtifacts]:
+        """
+        Extract artifacts from several messages at once.
         
+        URL and crypto matches need no per-message context, so they are
+        found in one pass over the joined batch and assigned back to their
+        message by offset. The context-gated passes (bank, phone, UPI/email)
+        still run per message. Same result as [extract(t) for t in texts].
+        """
+        if not texts:
+            return []
         try:
-            artifacts.phone_numbers = self._extract_phones(text)
+            joined = _BATCH_SEPARATOR.join(texts)
+            starts = list(accumulate((len(t) + 1 for t in texts[:-1]), initial=0))
+            raw_urls = [set() for _ in texts]
+            wallets = [set() for _ in texts]
+            for start, url in self._url_matches(joined):
+                raw_urls[bisect_right(starts, start) - 1].add(url)
+            crypto_pattern = _CRYPTO_PATTERN_ASCII if joined.isascii() else self._crypto_pattern
+            for match in crypto_pattern.finditer(joined):
+                wallets[bisect_right(starts, match.start(1)) - 1].add(match.group(1))
+            links = [self._dedupe_urls(urls) for urls in raw_urls]
         except Exception:
-            artifacts.phone_numbers = []
+            return [self._extract(text) for text in texts]
+        return [
+            self._extract(text, links[i], list(wallets[i]))
+            for i, text in enumerate(texts)
+        ]
+    
+    def _extract(
+        self,
+        text: str,
+        phishing_links: Optional[List[str]] = None,
+        crypto_wallets: Optional[List[str]] = None,
+    ) -> ExtractedArtifacts:
+        """extract() body; links/wallets may be pre-scanned by extract_batch()"""
+        artifacts = ExtractedArtifacts()
+        # Lowercased once, shared by every case-insensitive pass below
+        text_lower = text.lower()
         
-        try:
-            artifacts.crypto_wallets = self._extract_crypto(text)
-        except Exception:
-            artifacts.crypto_wallets = []
+        # Cheap literal triggers: a pass only runs if every match it could
+        # produce needs something the text actually contains. Most chat
+        # turns have no digits, '@' or URL, so most passes are skipped.
+        has_digit = _RE_DIGIT.search(text) is not None
+        has_at = '@' in text
+        has_upper = text_lower != text  # SWIFT codes can be letters only
         
-        try:
-            artifacts.emails = self._extract_emails(text, exclude=artifacts.upi_ids)
-        except Exception:
-            artifacts.emails = []
+        # Extract each category independently — failure in one must not block others
+        if has_at:
+            try:
+                artifacts.upi_ids = self._extract_upi(text, text_lower)
+            except Exception:
+                artifacts.upi_ids = []
+        
+        if has_digit or has_upper:
+            try:
+                artifacts.bank_accounts = self._extract_bank_details(text, text_lower)
+            except Exception:
+                artifacts.bank_accounts = []
+        
+        if phishing_links is not None:
+            artifacts.phishing_links = phishing_links
+        elif '.' in text or '://' in text:
+            try:
+                artifacts.phishing_links = self._extract_urls(text)
+            except Exception:
+                artifacts.phishing_links = []
+        
+        if has_digit:
+            try:
+                artifacts.phone_numbers = self._extract_phones(text, text_lower)
+            except Exception:
+                artifacts.phone_numbers = []
+        
+        if crypto_wallets is not None:
+            artifacts.crypto_wallets = crypto_wallets
+        elif any(trigger in text for trigger in _CRYPTO_TRIGGERS):
+            try:
+                artifacts.crypto_wallets = self._extract_crypto(text)
+            except Exception:
+                artifacts.crypto_wallets = []
+        
+        if has_at:
+            try:
+                artifacts.emails = self._extract_emails(text_lower if text.isascii() else text,
+                                                       exclude=artifacts.upi_ids)
+            except Exception:
+                artifacts.emails = []
         
         return artifacts
 
-    def extract_suspicious_keywords(self, text: str) -> List[str]:
+    def extract_suspicious_keywords(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """
         Extract suspicious scam-related keywords from text.
         Returns lowercase, deduplicated list of matched keywords.
+        Pass text_lower if the caller already has text.lower().
         """
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
+        if _SUSPICIOUS_KEYWORDS_AC is not None:
+            found = {kw for _, kw in _SUSPICIOUS_KEYWORDS_AC.iter(text_lower)}
+            # Report in keyword-list order, as the substring loop did
+            return [kw for kw in self._suspicious_keywords if kw in found]
         return [kw for kw in self._suspicious_keywords if kw in text_lower]
 
-    def _extract_upi(self, text: str) -> List[str]:
+    def _extract_upi(self, text: str, text_lower: str) -> List[str]:
         """Extract UPI IDs (excludes known email domains)"""
+        # Results are lowercased anyway; for ASCII, lower() keeps lengths and
+        # word boundaries intact, so match the lowered text case-sensitively
+        patterns = self._upi_patterns
+        if text.isascii():
+            text, patterns = text_lower, _UPI_PATTERNS_LOWER
         upi_ids = set()
-        for pattern in self._upi_patterns:
+        for pattern in patterns:
             for match in pattern.finditer(text):
                 upi_id = match.group(1).lower()
                 # Validate UPI format (user@provider)
@@ -367,10 +590,9 @@ class ArtifactExtractor:
                         upi_ids.add(upi_id)
         return list(upi_ids)
     
-    def _extract_bank_details(self, text: str) -> List[Dict[str, str]]:
+    def _extract_bank_details(self, text: str, text_lower: str) -> List[Dict[str, str]]:
         """Extract bank account details with context validation"""
         accounts = []
-        text_lower = text.lower()
         
         # Require banking context within the message to accept account numbers
         banking_context = any(kw in text_lower for kw in [
@@ -380,11 +602,12 @@ class ArtifactExtractor:
         ])
         
         # Look for account numbers with context
-        account_match = self._bank_patterns['account_number'].search(text)
-        ifsc_match = self._bank_patterns['ifsc'].search(text)
-        swift_match = self._bank_patterns['swift'].search(text)
-        routing_match = self._bank_patterns['routing'].search(text)
-        iban_match = self._bank_patterns['iban'].search(text)
+        patterns = _BANK_PATTERNS_ASCII if text.isascii() else self._bank_patterns
+        account_match = patterns['account_number'].search(text)
+        ifsc_match = patterns['ifsc'].search(text)
+        swift_match = patterns['swift'].search(text)
+        routing_match = patterns['routing'].search(text)
+        iban_match = patterns['iban'].search(text)
         
         # Build account object if we have enough info
         account = {}
@@ -430,30 +653,35 @@ class ArtifactExtractor:
     def _normalize_url(self, url: str) -> str:
         """Normalize URL by removing protocol and trailing slashes"""
         url = url.lower()
-        # Remove protocol
-        url = re.sub(r'^https?://', '', url)
+        # Remove protocol (fixed literal prefixes, no regex needed)
+        if url.startswith('https://'):
+            url = url[8:]
+        else:
+            url = url.removeprefix('http://')
         # Remove www.
-        url = re.sub(r'^www\.', '', url)
+        url = url.removeprefix('www.')
         # Remove trailing slash
         url = url.rstrip('/')
         return url
     
     def _extract_urls(self, text: str) -> List[str]:
         """Extract URLs and potential phishing links (deduplicated and normalized)"""
-        raw_urls = set()
-        
-        for pattern in self._url_patterns:
-            for match in pattern.finditer(text):
-                url = match.group(1)
-                # Skip if preceded by @ (part of an email address)
-                start_pos = match.start(1)
-                if start_pos > 0 and text[start_pos - 1] == '@':
-                    continue
-                # Clean and normalize
-                url = url.rstrip('.,;:!?)')
-                if len(url) > 8:  # Minimum meaningful URL length
-                    raw_urls.add(url)
-        
+        return self._dedupe_urls({url for _, url in self._url_matches(text)})
+    
+    def _url_matches(self, text: str):
+        """Yield (start, url) for each URL match worth keeping"""
+        for match in self._url_pattern.finditer(text):
+            url = match.group(1)
+            # Skip if preceded by @ (part of an email address)
+            start_pos = match.start(1)
+            if start_pos > 0 and text[start_pos - 1] == '@':
+                continue
+            # Trailing punctuation is already excluded by the pattern
+            if len(url) > 8:  # Minimum meaningful URL length
+                yield start_pos, url
+    
+    def _dedupe_urls(self, raw_urls: set) -> List[str]:
+        """Collapse raw URLs that normalize to the same link"""
         # Deduplicate by normalized form (remove http/https duplicates)
         normalized_map = {}
         for url in raw_urls:
@@ -466,9 +694,8 @@ class ArtifactExtractor:
         
         return list(normalized_map.values())
     
-    def _extract_phones(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_phones(self, text: str, text_lower: str) -> List[Dict[str, Any]]:
         """Extract phone numbers with Indian mobile prefix validation"""
-        text_lower = text.lower()
         # Only accept bare 10-digit if phone context present OR prefix validates
         has_phone_context = any(kw in text_lower for kw in [
             "call", "phone", "number", "mobile", "contact", "dial", "reach",
@@ -477,10 +704,11 @@ class ArtifactExtractor:
         
         seen_normalized = {}  # normalized_digits -> phone_object
         
-        for i, pattern in enumerate(self._phone_patterns):
+        patterns = _PHONE_PATTERNS_ASCII if text.isascii() else self._phone_patterns
+        for i, pattern in enumerate(patterns):
             for match in pattern.finditer(text):
                 phone = match.group(1)
-                normalized = re.sub(r'[-.\s()]', '', phone)
+                normalized = _RE_PHONE_SEPARATORS.sub('', phone)
                 
                 # ANY 10-digit all-numeric → check TRAI Indian mobile validation
                 if len(normalized) == 10 and normalized.isdigit():
@@ -524,29 +752,23 @@ class ArtifactExtractor:
     
     def _extract_crypto(self, text: str) -> List[str]:
         """Extract cryptocurrency wallet addresses"""
-        wallets = set()
-        
-        for pattern in self._crypto_patterns:
-            for match in pattern.finditer(text):
-                wallet = match.group(1)
-                wallets.add(wallet)
-        
-        return list(wallets)
+        pattern = _CRYPTO_PATTERN_ASCII if text.isascii() else self._crypto_pattern
+        return list({m.group(1) for m in pattern.finditer(text)})
     
     def _extract_emails(self, text: str, exclude: Optional[List[str]] = None) -> List[str]:
         """Extract email addresses (excluding UPI IDs)"""
         exclude = exclude or []
         exclude_lower = {e.lower() for e in exclude}
         
+        pattern = _EMAIL_PATTERN_ASCII if text.isascii() else self._email_pattern
         emails = set()
-        for match in self._email_pattern.finditer(text):
+        for match in pattern.finditer(text):
             email = match.group(1).lower()
             # Exclude UPI IDs (they look like emails)
             if email not in exclude_lower:
                 # Also exclude common UPI domains
                 domain = email.split('@')[1] if '@' in email else ''
-                upi_domains = {'paytm', 'gpay', 'phonepe', 'ybl', 'okaxis', 'oksbi', 'okhdfcbank', 'axl', 'ibl', 'upi'}
-                if domain not in upi_domains:
+                if domain not in _UPI_EMAIL_DOMAINS:
                     emails.add(email)
         
         return list(emails)
@@ -554,12 +776,18 @@ class ArtifactExtractor:
     def is_suspicious_url(self, url: str) -> bool:
         """Check if URL is from known suspicious domain"""
         url_lower = url.lower()
-        for domain in self._suspicious_domains:
-            if domain in url_lower:
-                return True
-        return False
+        if _SUSPICIOUS_DOMAINS_AC is not None:
+            return next(_SUSPICIOUS_DOMAINS_AC.iter(url_lower), None) is not None
+        return _SUSPICIOUS_DOMAINS_RE.search(url_lower) is not None
 
 
+@lru_cache(maxsize=1)
 def create_extractor() -> ArtifactExtractor:
-    """Factory function"""
+    """
+    Factory function.
+
+    Returns one shared instance per process: the extractor holds no
+    per-call state (patterns are module constants, the mobile validator is
+    a stateless classmethod), so every agent can use the same one.
+    """
     return ArtifactExtractor()
@@ -9,9 +9,29 @@ Wraps Ollama HTTP API with:
 """
 
 import re
+import json
 import logging
 import os
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Set, Tuple
+
+# Optional: HTTP client for Ollama (without it the service reports unavailable
+# and callers fall back to templates)
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+# Optional: Hyperscan one-pass check for the blocked output patterns
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +44,8 @@ OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "20"))         # seconds
 OLLAMA_TEMPERATURE = float(os.getenv("OLLAMA_TEMPERATURE", "0.7"))
 OLLAMA_TOP_P = float(os.getenv("OLLAMA_TOP_P", "0.9"))
 OLLAMA_MAX_TOKENS = int(os.getenv("OLLAMA_MAX_TOKENS", "60"))
+OLLAMA_POOL_SIZE = int(os.getenv("OLLAMA_POOL_SIZE", "16"))      # keep-alive connections
+OLLAMA_PROBE_TTL = float(os.getenv("OLLAMA_PROBE_TTL", "30"))    # seconds
 
 # ---------------------------------------------------------------------------
 # Persona system prompt — plain language, no brackets or scoring references.
@@ -78,28 +100,115 @@ INVESTIGATIVE_TARGETS = [
 # ---------------------------------------------------------------------------
 # Blocked output patterns — post-generation safety net
 # ---------------------------------------------------------------------------
-_BLOCKED_RE = [
-    re.compile(r'\b\d{10,}\b'),                     # 10+ digit numbers
-    re.compile(r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b'),  # phone patterns
-    re.compile(r'\b\d{4,6}\b'),                      # OTP-like
-    re.compile(r'\bOTP\b', re.I),
-    re.compile(r'\bPIN\b', re.I),
-    re.compile(r'\bpassword\b', re.I),
-]
+_BLOCKED_PATTERNS = (
+    r'\b\d{10,}\b',                     # 10+ digit numbers
+    r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',  # phone patterns
+    r'\b\d{4,6}\b',                      # OTP-like
+    r'\bOTP\b',
+    r'\bPIN\b',
+    r'\bpassword\b',
+)
+
+# One alternation, one sub. Alternatives keep the list order, and every
+# match spans whole \w-runs, so removing one can never create another:
+# the single pass yields exactly what six sequential subs did.
+# re.I only affects the word patterns.
+_BLOCKED_RE = re.compile("|".join(f"(?:{p})" for p in _BLOCKED_PATTERNS), re.I)
+
+
+def _build_blocked_hs_db():
+    """Compile all _BLOCKED_PATTERNS into one Hyperscan block-mode database."""
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[p.encode("ascii") for p in _BLOCKED_PATTERNS],
+        ids=list(range(len(_BLOCKED_PATTERNS))),
+        elements=len(_BLOCKED_PATTERNS),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(_BLOCKED_PATTERNS),
+    )
+    return db
+
+
+_blocked_hs_db = None
+if HYPERSCAN_AVAILABLE:
+    try:
+        _blocked_hs_db = _build_blocked_hs_db()
+    except Exception:
+        _blocked_hs_db = None  # Unsupported construct -> stay on re
+
+# Scratch space is per-thread (a single scratch cannot be shared by scans)
+_hs_local = threading.local()
+
+# Python's str \s also matches \x1c-\x1f; Hyperscan's does not
+_RE_HS_UNSAFE = re.compile(r'[\x1c-\x1f]')
+
+
+def _blocked_possible(text: str) -> bool:
+    """
+    False only when Hyperscan has checked the text in one pass and none of
+    the _BLOCKED_PATTERNS match. Without Hyperscan, or for non-ASCII text
+    (byte semantics would differ from re), always True.
+    """
+    if _blocked_hs_db is None or not text.isascii() or _RE_HS_UNSAFE.search(text):
+        return True
+    scratch = getattr(_hs_local, "scratch", None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_blocked_hs_db)
+    found = False
+
+    def on_match(pattern_id, start, end, flags, context):
+        nonlocal found
+        found = True
+
+    _blocked_hs_db.scan(text.encode("ascii"), match_event_handler=on_match, scratch=scratch)
+    return found
 
 
 def _sanitize_llm_output(text: str) -> str:
     """Strip blocked content, leaked brackets, collapse whitespace, cap length."""
     # Defence-in-depth: strip any bracketed fragments the model echoed
     text = re.sub(r'\[.*?\]', '', text)
-    for pat in _BLOCKED_RE:
-        text = pat.sub("", text)
+    # Most replies contain nothing blocked: the Hyperscan check is cheaper
+    # than the backtracking alternation, which only runs on a hit
+    if _blocked_possible(text):
+        text = _BLOCKED_RE.sub("", text)
     text = re.sub(r'\s+', ' ', text).strip()
     if len(text) > 200:
         text = text[:200].rsplit(' ', 1)[0] + "..."
     return text
 
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# One keep-alive pool per process: clients are built per agent/request,
+# so a per-instance session would never reuse a connection
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _shared_session():
+    """Return the process-wide requests.Session, creating it on first use."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=OLLAMA_POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+
+# Background availability re-probes (one at a time, process-wide)
+_probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ollama-probe")
+
+# Last probe result per base URL: (available, monotonic expiry). Kept at
+# module level so a client built per agent does not re-probe synchronously
+_availability: Dict[str, Tuple[bool, float]] = {}
+_probes_pending: Set[str] = set()
+_availability_lock = threading.Lock()
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # OllamaClient
 # ═══════════════════════════════════════════════════════════════════════════
@@ -133,26 +242,63 @@ class OllamaClient:
         self.max_tokens = max_tokens
         self.timeout = timeout
         self.base_url = base_url.rstrip("/")
-        self._available: Optional[bool] = None  # lazy probe
+        self._payload_key: Optional[tuple] = None
+        self._payload_prefix = ""  # see _generate_body()
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
+    def session(self):
+        """
+        Shared HTTP session with a keep-alive connection pool.
+
+        Every call to Ollama reuses pooled connections instead of paying
+        TCP setup per request. The pool is process-wide, so clients built
+        per agent still share connections. Created on first use; requires
+        requests (is_available() is False without it, so callers never
+        get here).
+        """
+        return _shared_session()
+
     def is_available(self) -> bool:
-        """Quick connectivity check (cached after first probe)."""
-        if self._available is not None:
-            return self._available
+        """
+        Quick connectivity check.
+
+        The result is cached per base URL for OLLAMA_PROBE_TTL seconds and
+        shared by every client. Only the first call for a host probes
+        synchronously; after expiry the last known state is returned while
+        a background probe refreshes it, so an Ollama restart is picked up
+        without putting network I/O on the hot path.
+        """
+        if not REQUESTS_AVAILABLE:
+            return False
+        entry = _availability.get(self.base_url)
+        if entry is None:
+            return self._probe()
+        available, expires = entry
+        if time.monotonic() >= expires:
+            with _availability_lock:
+                submit = self.base_url not in _probes_pending
+                _probes_pending.add(self.base_url)
+            if submit:
+                _probe_executor.submit(self._probe)
+        return available
+
+    def _probe(self) -> bool:
+        """GET /api/tags and record the result for this host with a fresh TTL."""
         try:
-            import requests
-            resp = requests.get(
+            resp = self.session().get(
                 f"{self.base_url}/api/tags",
                 timeout=3,
             )
-            self._available = resp.status_code == 200
+            available = resp.status_code == 200
         except Exception:
-            self._available = False
-        return self._available
+            available = False
+        with _availability_lock:
+            _availability[self.base_url] = (available, time.monotonic() + OLLAMA_PROBE_TTL)
+            _probes_pending.discard(self.base_url)
+        return available
 
     def call_ollama(
         self,
@@ -179,20 +325,10 @@ class OllamaClient:
         prompt = self._build_prompt(state, conversation_history, latest_scammer_message)
 
         try:
-            import requests
-            resp = requests.post(
+            resp = self.session().post(
                 f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "system": PERSONA_SYSTEM_PROMPT,
-                    "stream": False,
-                    "options": {
-                        "num_predict": self.max_tokens,
-                        "temperature": self.temperature,
-                        "top_p": self.top_p,
-                    },
-                },
+                data=self._generate_body(prompt),
+                headers=_JSON_HEADERS,
                 timeout=self.timeout,
             )
             if not resp.ok:
@@ -217,6 +353,30 @@ class OllamaClient:
     # Prompt construction (private)
     # ------------------------------------------------------------------
 
+    def _generate_body(self, prompt: str) -> bytes:
+        """
+        JSON body for /api/generate.
+
+        Everything except the prompt (model, options and the ~1 KB persona
+        system prompt) is serialized once and reused; only the prompt is
+        encoded per call. Rebuilt if the model settings are changed.
+        """
+        key = (self.model, self.max_tokens, self.temperature, self.top_p)
+        if key != self._payload_key:
+            static = json.dumps({
+                "model": self.model,
+                "system": PERSONA_SYSTEM_PROMPT,
+                "stream": False,
+                "options": {
+                    "num_predict": self.max_tokens,
+                    "temperature": self.temperature,
+                    "top_p": self.top_p,
+                },
+            })
+            self._payload_prefix = static[:-1]  # drop the closing brace
+            self._payload_key = key
+        return f'{self._payload_prefix}, "prompt": {json.dumps(prompt)}}}'.encode("utf-8")
+
     def _build_prompt(
         self,
         state: str,
@@ -22,19 +22,29 @@ SECURITY:
 """
 
 import re
-import random
 import threading
 import time
 import logging
 import difflib
-from typing import Optional, Generator, Callable, Dict, List
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, Generator, Callable, Deque, Dict, List
 
 # Use v2 config
 import config_v2 as config
 
 from state_machine_v2 import AgentState
+from templates import render_template, pick_fill, template_fields
 from llm_service import OllamaClient, RED_FLAG_CONCEPTS, INVESTIGATIVE_TARGETS, PERSONA_SYSTEM_PROMPT
 
+# Optional: one Aho-Corasick automaton for the reply keyword checks
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # ──────────────────────────────────────────────────────────────────
@@ -57,11 +67,109 @@ RED_FLAG_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+# Cheap gate for the digit-shape block patterns in _sanitize
+_RE_DIGIT = re.compile(r'\d')
+_RE_DIGIT_RUN = re.compile(r'\b\d{4,}\b')
+
+# Leftover {placeholder} after a template fill (same grammar as templates.py)
+_RE_PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
 
 # ──────────────────────────────────────────────────────────────────
 # Output sanitizer — strips leaked system artifacts from LLM output
 # ──────────────────────────────────────────────────────────────────
 
+# Compiled once at import; the sanitizers run on every turn
+_RE_BOLD = re.compile(r'\*\*(.+?)\*\*')
+_RE_ITALIC = re.compile(r'\*(.+?)\*')
+_RE_HEADER = re.compile(r'#+\s*')
+_RE_CODEBLOCK = re.compile(r'```.*?```', re.DOTALL)
+_RE_INLINE_CODE = re.compile(r'`(.+?)`')
+_RE_BULLET = re.compile(r'^[-*]\s+', re.MULTILINE)
+_RE_ROLE_PREFIX = re.compile(r'^(You|Me|Agent|Assistant|Elderly|Person):\s*', re.IGNORECASE)
+_RE_SENT_SPLIT = re.compile(r'(?<=[.?!])\s+')
+_RE_WS = re.compile(r'\s+')
+
+# Lines starting with these (case-insensitive) echo system prompt sections
+_ECHO_PREFIXES = (
+    "rules:", "response rules:", "red flag", "investigative",
+    "engagement", "behaviour:", "behavior:", "system:", "note:",
+    "instruction", "reminder", "never:", "always:",
+)
+_ECHO_PREFIX_ALT = "|".join(map(re.escape, _ECHO_PREFIXES))
+
+# One line-filter pass: a blank line or an echoed section line, together
+# with its newline. The prefix group is ASCII-only case folding, which
+# agrees with str.lower() here (re's Unicode folding also maps e.g. 'ſ'
+# to 's'); [^\S\n] is str.strip()'s whitespace without the line break.
+_RE_BAD_LINE = re.compile(
+    rf'^[^\S\n]*(?:(?ai:{_ECHO_PREFIX_ALT}).*)?(?:\n|\Z)', re.MULTILINE,
+)
+
+# Anything the bracket / line / markdown / role-prefix passes could touch:
+# brackets, newlines, markdown marks, a leading bullet dash, a leading role
+# prefix or a leading echoed prompt section (a superset of what they strip).
+# Clean single-line replies miss this and skip straight to the phrase checks.
+_RE_ANY_ARTIFACT = re.compile(
+    r'[\[\n*#`]'
+    r'|^\s*(?:-|(?:You|Me|Agent|Assistant|Elderly|Person):|'
+    + _ECHO_PREFIX_ALT + ')',
+    re.IGNORECASE,
+)
+
+# Persona-breaking phrases (first line of defense)
+_AI_REVEAL_PATTERNS = (
+    r'\bAs an AI language model\b[,.]?\s*',
+    r'\bI am (?:just )?an? AI\b[,.]?\s*',
+    r'\bAs an? (?:AI|artificial intelligence)\b[,.]?\s*',
+    r'\bI(?:\'m| am) (?:a |an? )?(?:virtual |digital )?assistant\b[,.]?\s*',
+    r'\bI(?:\'m| am) programmed\b[,.]?\s*',
+    r'\bprogrammed to\b',
+    r'\bI cannot provide financial advice\b[,.]?\s*',
+    r'\bI\'m not able to provide (?:financial |legal )?advice\b[,.]?\s*',
+    r'\bdesigned to\b',
+    r'\balgorithm\b',
+    r'\blanguage model\b',
+    r'\bchatbot\b',
+)
+_AI_REVEAL_RES = tuple(re.compile(p, re.IGNORECASE) for p in _AI_REVEAL_PATTERNS)
+
+# All of them in one alternation: a single scan answers "anything to strip?"
+_RE_AI_REVEAL = re.compile(
+    "|".join(f"(?:{p})" for p in _AI_REVEAL_PATTERNS), re.IGNORECASE,
+)
+
+
+def _strip_brackets(text: str) -> str:
+    """
+    Remove [bracketed] spans, exactly like re.sub(r'\[.*?\]', '', text).
+
+    The regex retries from every '[' and scans to the end of the line when
+    no ']' follows, which is quadratic on output like "[[[[...". Here a
+    '[' with no ']' before the next newline skips the rest of that line.
+    """
+    out = []
+    pos = 0
+    while True:
+        start = text.find('[', pos)
+        if start < 0:
+            break
+        end = text.find(']', start + 1)
+        if end < 0:
+            break
+        newline = text.find('\n', start + 1, end)
+        if newline >= 0:
+            # No ']' on this line: no '[' before the newline can match
+            out.append(text[pos:newline])
+            pos = newline
+            continue
+        out.append(text[pos:start])
+        pos = end + 1
+    out.append(text[pos:])
+    return "".join(out)
+
+
+@lru_cache(maxsize=512)
 def sanitize_output(text: str) -> str:
     """
     Strip leaked system artifacts from LLM output.
@@ -73,67 +181,79 @@ def sanitize_output(text: str) -> str:
       - Role prefixes: You:, Assistant:
 
     This function removes all of them before validation runs.
+    Pure function of its input, so results are memoized: template
+    fallbacks repeat the same raw strings turn after turn.
     """
-    # Remove inline bracketed content FIRST: [anything]
-    # Must run before line-level filtering so partial lines survive.
-    text = re.sub(r'\[.*?\]', '', text)
-
-    # Remove lines that are empty after bracket stripping
-    lines = text.split("\n")
-    lines = [ln for ln in lines if ln.strip()]
-    text = "\n".join(lines)
-
-    # Remove lines that echo system prompt sections
-    _echo_prefixes = (
-        "rules:", "response rules:", "red flag", "investigative",
-        "engagement", "behaviour:", "behavior:", "system:", "note:",
-        "instruction", "reminder", "never:", "always:",
-    )
-    lines = text.split("\n")
-    lines = [ln for ln in lines if not ln.strip().lower().startswith(_echo_prefixes)]
-    text = "\n".join(lines)
-
-    # Strip markdown formatting
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)       # **bold**
-    text = re.sub(r'\*(.+?)\*', r'\1', text)            # *italic*
-    text = re.sub(r'#+\s*', '', text)                    # # headers
-    text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)  # code blocks
-    text = re.sub(r'`(.+?)`', r'\1', text)               # `inline code`
-    text = re.sub(r'^[-*]\s+', '', text, flags=re.MULTILINE)  # bullet points
-
-    # Remove echoed role prefix
-    text = re.sub(
-        r'^(You|Me|Agent|Assistant|Elderly|Person):\s*',
-        '', text.strip(), flags=re.IGNORECASE,
-    )
+    # Most replies are one clean line: skip the structural passes entirely
+    if _RE_ANY_ARTIFACT.search(text):
+        # Remove inline bracketed content FIRST: [anything]
+        # Must run before line-level filtering so partial lines survive.
+        if '[' in text:
+            text = _strip_brackets(text)
+
+        # Remove lines that are empty after bracket stripping, and lines
+        # that echo system prompt sections. Kept lines are rejoined with
+        # single newlines, so drop the separator a removed last line leaves.
+        text = _RE_BAD_LINE.sub('', text).rstrip("\n")
+
+        # Strip markdown formatting (each pass only if its marker is present)
+        if '*' in text:
+            text = _RE_BOLD.sub(r'\1', text)           # **bold**
+            text = _RE_ITALIC.sub(r'\1', text)         # *italic*
+        if '#' in text:
+            text = _RE_HEADER.sub('', text)            # # headers
+        if '`' in text:
+            text = _RE_CODEBLOCK.sub('', text)         # code blocks
+            text = _RE_INLINE_CODE.sub(r'\1', text)    # `inline code`
+        if '-' in text or '*' in text:
+            text = _RE_BULLET.sub('', text)            # bullet points
+
+        # Remove echoed role prefix
+        text = text.strip()
+        if ':' in text:
+            text = _RE_ROLE_PREFIX.sub('', text)
 
-    # Strip persona-breaking phrases (first line of defense)
-    _ai_reveal_patterns = [
-        r'(?i)\bAs an AI language model\b[,.]?\s*',
-        r'(?i)\bI am (?:just )?an? AI\b[,.]?\s*',
-        r'(?i)\bAs an? (?:AI|artificial intelligence)\b[,.]?\s*',
-        r'(?i)\bI(?:\'m| am) (?:a |an? )?(?:virtual |digital )?assistant\b[,.]?\s*',
-        r'(?i)\bI(?:\'m| am) programmed\b[,.]?\s*',
-        r'(?i)\bprogrammed to\b',
-        r'(?i)\bI cannot provide financial advice\b[,.]?\s*',
-        r'(?i)\bI\'m not able to provide (?:financial |legal )?advice\b[,.]?\s*',
-        r'(?i)\bdesigned to\b',
-        r'(?i)\balgorithm\b',
-        r'(?i)\blanguage model\b',
-        r'(?i)\bchatbot\b',
-    ]
-    for pat in _ai_reveal_patterns:
-        text = re.sub(pat, '', text)
+    # Strip persona-breaking phrases (first line of defense). They are rare,
+    # so one fused scan gates the per-pattern subs; those stay sequential
+    # because stripping one phrase can expose another.
+    if _RE_AI_REVEAL.search(text):
+        for pat in _AI_REVEAL_RES:
+            text = pat.sub('', text)
 
     # Strip duplicate leading phrases
     # e.g. "Wait, you need a code from me? Wait, you need a code from me?"
-    sentences = re.split(r'(?<=[.?!])\s+', text.strip())
-    if len(sentences) >= 2 and sentences[0].strip().lower() == sentences[1].strip().lower():
-        text = ' '.join(sentences[1:])
+    # Only the first two sentences matter: find their two boundaries
+    # instead of splitting the whole reply into a list
+    text = text.strip()
+    first = _RE_SENT_SPLIT.search(text)
+    if first:
+        rest = text[first.end():]
+        second = _RE_SENT_SPLIT.search(rest)
+        lead = text[:first.start()]
+        following = rest[:second.start()] if second else rest
+        if lead.strip().lower() == following.strip().lower():
+            text = rest
 
     # Collapse whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _RE_WS.sub(' ', text).strip()
+
+    return text
+
 
+@lru_cache(maxsize=512)
+def _sanitize_impl(text: str, blocked_re: re.Pattern, blocked_word_re: re.Pattern) -> str:
+    """Body of TemplateBasedLLM._sanitize (pure, so memoized per pattern pair)."""
+    # Digit-shape patterns are most of the block list; skip them
+    # entirely when the text has no digits at all
+    if _RE_DIGIT.search(text):
+        text = blocked_re.sub("", text)
+        text = _RE_DIGIT_RUN.sub('', text)
+    else:
+        text = blocked_word_re.sub("", text)
+    text = text.strip()
+    text = _RE_WS.sub(' ', text)
+    if len(text) > 150:
+        text = text[:150].rsplit(' ', 1)[0] + "..."
     return text
 
 
@@ -148,8 +268,52 @@ _PERSONA_BREAKS = [
     "language model",
 ]
 
-
-def validate_response(response: str) -> bool:
+# One alternation per keyword list, searched against the lowered reply.
+# Matching lowered text (not re.IGNORECASE) keeps `in`'s exact semantics.
+_RE_RED_FLAG = re.compile("|".join(map(re.escape, RED_FLAG_KEYWORDS)))
+_RE_INV_PHRASE = re.compile("|".join(map(re.escape, _INV_PHRASES)))
+_RE_PERSONA_BREAK = re.compile("|".join(map(re.escape, _PERSONA_BREAKS)))
+
+# Tags for the three keyword lists, reported by _reply_keyword_tags()
+_TAG_RED_FLAG, _TAG_INV, _TAG_PERSONA_BREAK = "RF", "INV", "PB"
+
+# All three lists in one automaton: a single pass over the lowered reply
+# yields every list that has a hit (plain substring semantics, same as `in`)
+_REPLY_KEYWORDS_AC = None
+if AHOCORASICK_AVAILABLE:
+    _ac_tags: Dict[str, set] = {}
+    for _tag, _words in (
+        (_TAG_RED_FLAG, RED_FLAG_KEYWORDS),
+        (_TAG_INV, _INV_PHRASES),
+        (_TAG_PERSONA_BREAK, _PERSONA_BREAKS),
+    ):
+        for _w in _words:
+            _ac_tags.setdefault(_w, set()).add(_tag)
+    _REPLY_KEYWORDS_AC = ahocorasick.Automaton()
+    for _w, _tags in _ac_tags.items():
+        _REPLY_KEYWORDS_AC.add_word(_w, frozenset(_tags))
+    _REPLY_KEYWORDS_AC.make_automaton()
+    del _ac_tags
+
+
+def _reply_keyword_tags(reply_lower: str) -> set:
+    """Which keyword lists (_TAG_*) have at least one hit in reply_lower."""
+    if _REPLY_KEYWORDS_AC is not None:
+        found = set()
+        for _, tags in _REPLY_KEYWORDS_AC.iter(reply_lower):
+            found |= tags
+        return found
+    found = set()
+    if _RE_RED_FLAG.search(reply_lower):
+        found.add(_TAG_RED_FLAG)
+    if _RE_INV_PHRASE.search(reply_lower):
+        found.add(_TAG_INV)
+    if _RE_PERSONA_BREAK.search(reply_lower):
+        found.add(_TAG_PERSONA_BREAK)
+    return found
+
+
+def validate_response(response: str, reply_lower: Optional[str] = None) -> bool:
     """
     STRICT post-generation quality gate.  Returns False if ANY check fails.
 
@@ -158,15 +322,19 @@ def validate_response(response: str) -> bool:
       2. Contains >= 1 investigative phrase (employee id | branch | manager | callback number | case id)
       3. Contains a question mark
       4. Does NOT contain persona-breaking text
+
+    reply_lower, if given, must be response.lower() (saves recomputing it).
     """
-    reply_lower = response.lower()
+    if reply_lower is None:
+        reply_lower = response.lower()
+    tags = _reply_keyword_tags(reply_lower)
 
     # Check 1: Red-flag keyword (case-insensitive)
-    if not any(keyword in reply_lower for keyword in RED_FLAG_KEYWORDS):
+    if _TAG_RED_FLAG not in tags:
         return False
 
     # Check 2: Investigative phrase
-    if not any(p in reply_lower for p in _INV_PHRASES):
+    if _TAG_INV not in tags:
         return False
 
     # Check 3: Question mark present
@@ -174,42 +342,60 @@ def validate_response(response: str) -> bool:
         return False
 
     # Check 4: No persona-breaking text
-    if any(p in reply_lower for p in _PERSONA_BREAKS):
+    if _TAG_PERSONA_BREAK in tags:
         return False
 
     return True
 
 
+# Every question contains an _INV_PHRASES keyword
+_FOLLOWUP_QUESTIONS = (
+    "What is your employee ID?",
+    "Which branch are you calling from?",
+    "What is your manager's name?",
+    "Can you give me your official callback number?",
+    "Do you have a case ID for this?",
+    "What branch did you say you were at?",
+    "Who is your manager there?",
+)
+
+# Red-flag phrases (each contains a RED_FLAG_KEYWORDS word), with the
+# joining space already appended
+_RF_INJECT_PREFIXES = tuple(p + " " for p in (
+    "This sounds like an account compromise attempt.",
+    "That seems very suspicious to me.",
+    "I think this might be fraud.",
+    "This feels like an unauthorized request.",
+    "You mentioned an OTP and that worries me.",
+    "Are you asking for a verification code from me?",
+    "This sounds like a security risk.",
+))
+
+
 def _append_followup_question(response: str, turn_count: int = 0) -> str:
     """
     Append an investigative question guaranteeing an _INV_PHRASES keyword
     and a trailing '?'.  Skipped only if response already contains an
     investigative phrase AND ends with '?'.
     """
-    lower = response.lower()
-    has_inv = any(p in lower for p in _INV_PHRASES)
+    has_inv = _TAG_INV in _reply_keyword_tags(response.lower())
     has_q = response.strip().endswith("?")
 
     if has_inv and has_q:
         return response  # already valid
 
-    # Every question contains an _INV_PHRASES keyword
-    _followup_questions = [
-        "What is your employee ID?",
-        "Which branch are you calling from?",
-        "What is your manager's name?",
-        "Can you give me your official callback number?",
-        "Do you have a case ID for this?",
-        "What branch did you say you were at?",
-        "Who is your manager there?",
-    ]
-    idx = turn_count % len(_followup_questions)
+    question = _FOLLOWUP_QUESTIONS[turn_count % len(_FOLLOWUP_QUESTIONS)]
     if response and not response.endswith(" "):
-        response += " "
-    return response + _followup_questions[idx]
+        return response + " " + question
+    return response + question
 
 
-def _inject_red_flag_concern(response: str, turn_count: int = 0, scammer_message: str = "") -> str:
+def _inject_red_flag_concern(
+    response: str,
+    turn_count: int = 0,
+    scammer_message: str = "",
+    reply_lower: Optional[str] = None,
+) -> str:
     """
     Prepend a red-flag phrase if response lacks a RED_FLAG_KEYWORDS hit.
 
@@ -221,29 +407,46 @@ def _inject_red_flag_concern(response: str, turn_count: int = 0, scammer_message
     - Handles persona breaks with full replacement.
     - Idempotent — will not double-inject if keyword already exists.
     - Does NOT depend on LLM to include keywords.
+    - reply_lower, if given, must be response.lower().
     """
-    reply_lower = response.lower()
+    if reply_lower is None:
+        reply_lower = response.lower()
+    tags = _reply_keyword_tags(reply_lower)
 
     # ── Persona break → full replacement (most critical) ────────────
-    if any(p in reply_lower for p in _PERSONA_BREAKS):
+    if _TAG_PERSONA_BREAK in tags:
         return "I'm confused. You mentioned an OTP and that worries me."
 
     # ── Already has a red-flag keyword → skip injection ─────────────
-    if any(keyword in reply_lower for keyword in RED_FLAG_KEYWORDS):
+    if _TAG_RED_FLAG in tags:
         return response
 
     # ── Prepend a red-flag phrase (each contains a RED_FLAG_KEYWORDS word)
-    _rf_inject_phrases = [
-        "This sounds like an account compromise attempt.",
-        "That seems very suspicious to me.",
-        "I think this might be fraud.",
-        "This feels like an unauthorized request.",
-        "You mentioned an OTP and that worries me.",
-        "Are you asking for a verification code from me?",
-        "This sounds like a security risk.",
-    ]
-    idx = turn_count % len(_rf_inject_phrases)
-    return _rf_inject_phrases[idx] + " " + response
+    return _RF_INJECT_PREFIXES[turn_count % len(_RF_INJECT_PREFIXES)] + response
+
+
+# ──────────────────────────────────────────────────────────────────
+# Anti-repetition — near-duplicate check against recent replies
+# ──────────────────────────────────────────────────────────────────
+
+_SIMILARITY_RATIO = 0.70   # difflib ratio at which a reply counts as a repeat
+
+
+def _is_near_duplicate(matcher: difflib.SequenceMatcher, prev: str) -> bool:
+    """
+    True if lowered reply prev is >= _SIMILARITY_RATIO alike the candidate.
+
+    matcher holds the lowered candidate as seq2, so its index is built once
+    for every prev it is compared with. The length and character-count
+    bounds are upper bounds on ratio(): they only skip pairs that could
+    never reach the threshold, before the O(n·m) matching runs.
+    """
+    matcher.set_seq1(prev)
+    return (
+        matcher.real_quick_ratio() >= _SIMILARITY_RATIO
+        and matcher.quick_ratio() >= _SIMILARITY_RATIO
+        and matcher.ratio() >= _SIMILARITY_RATIO
+    )
 
 
 class TemplateBasedLLM:
@@ -271,16 +474,16 @@ class TemplateBasedLLM:
         # Streaming callback (kept for legacy compatibility)
         self.on_token: Optional[Callable] = None
 
-        # Blocked patterns (compiled once)
-        self._blocked_patterns = [
-            re.compile(p, re.IGNORECASE) for p in config.BLOCKED_PATTERNS
-        ]
+        # Blocked patterns (fused into one alternation in config_v2)
+        self._blocked_re = config.BLOCKED_UNION_RE
+        self._blocked_word_re = config.BLOCKED_WORD_UNION_RE
 
         # Ollama client (primary engine)
         self._ollama = OllamaClient()
 
-        # Anti-repetition: stores last 2 responses per session
-        self._recent_responses: Dict[str, List[str]] = {}
+        # Anti-repetition: recent lowered replies per session
+        # (bounded deque: appending past maxlen drops the oldest in O(1))
+        self._recent_responses: Dict[str, Deque[str]] = {}
 
         self._load_model()
 
@@ -361,12 +564,15 @@ class TemplateBasedLLM:
                 result = self.generate_response(state, template, fills, context="")
             return result
 
-        def _is_too_similar(candidate: str) -> bool:
-            """Check if candidate is ≥70% similar to any of last 2 responses."""
-            recent = self._recent_responses.get(session_id, [])
-            for prev in recent[-2:]:
-                ratio = difflib.SequenceMatcher(None, prev.lower(), candidate.lower()).ratio()
-                if ratio >= 0.70:
+        def _is_too_similar(cand: str) -> bool:
+            """Check if lowered candidate is ≥70% similar to any of last 2 responses."""
+            recent = self._recent_responses.get(session_id)
+            if not recent:
+                return False
+            matcher = difflib.SequenceMatcher(None, b=cand)
+            # Last 2 replies, newest first (deques don't slice)
+            for prev in islice(reversed(recent), 2):
+                if _is_near_duplicate(matcher, prev):
                     return True
             return False
 
@@ -374,29 +580,34 @@ class TemplateBasedLLM:
         raw = _generate_raw()
         clean = sanitize_output(raw)
         clean = self._sanitize(clean)
+        # Lowered once; the checks below share it until the text changes
+        clean_lower = clean.lower()
 
         # ── Anti-repetition: regenerate once if too similar ─────────
-        if _is_too_similar(clean):
+        if _is_too_similar(clean_lower):
             raw2 = self.generate_response(state, template, fills, context="")
             alt = sanitize_output(raw2)
             alt = self._sanitize(alt)
-            if not _is_too_similar(alt):
-                clean = alt
+            alt_lower = alt.lower()
+            if not _is_too_similar(alt_lower):
+                clean, clean_lower = alt, alt_lower
 
         # ── Deterministic enforcement (PART 4 pipeline) ─────────────
-        if not validate_response(clean):
-            clean = _inject_red_flag_concern(clean, turn_count, latest_scammer_message)
+        if not validate_response(clean, clean_lower):
+            clean = _inject_red_flag_concern(
+                clean, turn_count, latest_scammer_message, reply_lower=clean_lower,
+            )
             clean = _append_followup_question(clean, turn_count)
+            clean_lower = clean.lower()
 
-        assert validate_response(clean), f"Post-injection validation failed: {clean}"
+        assert validate_response(clean, clean_lower), f"Post-injection validation failed: {clean}"
 
         # ── Record response for anti-repetition ─────────────────────
-        if session_id not in self._recent_responses:
-            self._recent_responses[session_id] = []
-        self._recent_responses[session_id].append(clean)
         # Keep only last 4 to bound memory
-        if len(self._recent_responses[session_id]) > 4:
-            self._recent_responses[session_id] = self._recent_responses[session_id][-4:]
+        recent = self._recent_responses.get(session_id)
+        if recent is None:
+            recent = self._recent_responses[session_id] = deque(maxlen=4)
+        recent.append(clean_lower)
 
         return clean
 
@@ -417,7 +628,7 @@ class TemplateBasedLLM:
         FAST PATH (~1ms): Direct fill.
         LLM PATH (~100ms): Use local LLM to fill remaining blanks.
         """
-        has_blanks = "{" in template and "}" in template
+        has_blanks = bool(template_fields(template))
 
         if not has_blanks or self.backend == "template-only":
             response = self._fill_template(template, fills)
@@ -433,17 +644,8 @@ class TemplateBasedLLM:
 
     def _fill_template(self, template: str, fills: Dict[str, str]) -> str:
         """Fill template placeholders, including fallback for missing keys."""
-        result = template
-        for key, value in fills.items():
-            result = result.replace(f"{{{key}}}", value)
-
-        # Safety net: replace any remaining {placeholder} with a random fill
-        remaining = re.findall(r'\{(\w+)\}', result)
-        for key in remaining:
-            options = config.TEMPLATE_FILLS.get(key, ["something"])
-            result = result.replace(f"{{{key}}}", random.choice(options), 1)
-
-        return result
+        # Safety net: any {placeholder} not in fills gets a random fill
+        return render_template(template, fills, missing=pick_fill)
 
     def _generate_with_llm(
         self,
@@ -456,7 +658,7 @@ class TemplateBasedLLM:
         partial = self._fill_template(template, fills)
 
         if "{" in partial:
-            match = re.search(r'\{(\w+)\}', partial)
+            match = _RE_PLACEHOLDER.search(partial)
             if match:
                 blank = match.group(1)
                 filled = self._llm_fill_blank(blank, state)
@@ -478,7 +680,7 @@ class TemplateBasedLLM:
             elif self.backend == "ollama":
                 result = self._generate_ollama_legacy(prompt, 10)
             else:
-                options = config.TEMPLATE_FILLS.get(blank_name, ["something"])
+                options = config.TEMPLATE_FILLS.get(blank_name, ("something",))
                 idx = hash((state.name, blank_name)) % len(options)
                 result = options[idx]
 
@@ -506,8 +708,7 @@ class TemplateBasedLLM:
     def _generate_ollama_legacy(self, prompt: str, max_tokens: int) -> str:
         """Non-streaming Ollama — used only for blank-filling."""
         try:
-            import requests
-            resp = requests.post(
+            resp = self._ollama.session().post(
                 f"{self._ollama.base_url}/api/generate",
                 json={
                     "model": self._ollama.model,
@@ -536,7 +737,7 @@ class TemplateBasedLLM:
         context: str = "",
     ) -> Generator[str, None, None]:
         """Generate with streaming tokens (for TTS pipeline)."""
-        has_blanks = "{" in template and "}" in template
+        has_blanks = bool(template_fields(template))
 
         if not has_blanks or self.backend == "template-only":
             response = self._fill_template(template, fills)
@@ -583,14 +784,15 @@ class TemplateBasedLLM:
         context: str,
     ) -> Generator[str, None, None]:
         """Stream from Ollama."""
-        import requests
         import json as _json
 
         prompt = self._build_prompt(state, context)
         accumulated = ""
 
         try:
-            resp = requests.post(
+            # Context manager returns the pooled connection even when the
+            # loop stops early on "done"
+            with self._ollama.session().post(
                 f"{self._ollama.base_url}/api/generate",
                 json={
                     "model": self._ollama.model,
@@ -603,16 +805,15 @@ class TemplateBasedLLM:
                 },
                 stream=True,
                 timeout=20,
-            )
-
-            for line in resp.iter_lines():
-                if line:
-                    data = _json.loads(line)
-                    token = data.get("response", "")
-                    accumulated += token
-                    yield self._sanitize(accumulated)
-                    if data.get("done"):
-                        break
+            ) as resp:
+                for line in resp.iter_lines():
+                    if line:
+                        data = _json.loads(line)
+                        token = data.get("response", "")
+                        accumulated += token
+                        yield self._sanitize(accumulated)
+                        if data.get("done"):
+                            break
         except Exception:
             yield self._sanitize(self._fill_template(template, fills))
 
@@ -633,14 +834,7 @@ class TemplateBasedLLM:
 
     def _sanitize(self, text: str) -> str:
         """Remove blocked patterns, cap length."""
-        for pattern in self._blocked_patterns:
-            text = pattern.sub("", text)
-        text = re.sub(r'\b\d{4,}\b', '', text)
-        text = text.strip()
-        text = re.sub(r'\s+', ' ', text)
-        if len(text) > 150:
-            text = text[:150].rsplit(' ', 1)[0] + "..."
-        return text
+        return _sanitize_impl(text, self._blocked_re, self._blocked_word_re)
 
 
 def create_llm() -> TemplateBasedLLM:
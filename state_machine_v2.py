@@ -19,10 +19,258 @@ from typing import Optional, List, Dict, Tuple
 from dataclasses import dataclass, field
 import re
 import time
+import threading
 
 # Use v2 config
 import config_v2 as config
 from behavior_scorer import BehaviorScorer, create_scorer
+from templates import render_template
+
+# Optional: Hyperscan DFA scanner for the security pattern lists
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Optional: Aho-Corasick automaton for the literal FORCE_EXTRACT keywords
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+# =============================================================================
+# PATTERN CLASSIFIER - one scan for jailbreak / extract / blocked
+# =============================================================================
+
+PATTERN_JAILBREAK = 1
+PATTERN_EXTRACT = 2
+PATTERN_BLOCKED = 4
+
+_PATTERN_GROUPS = (
+    (PATTERN_JAILBREAK, config.JAILBREAK_PATTERNS, config.JAILBREAK_UNION_RE),
+    (PATTERN_EXTRACT, config.EXTRACT_FORCE_PATTERNS, config.EXTRACT_FORCE_UNION_RE),
+    (PATTERN_BLOCKED, config.BLOCKED_PATTERNS, config.BLOCKED_UNION_RE),
+)
+
+# Python's str \s also matches \x1c-\x1f; Hyperscan's does not
+_RE_HS_UNSAFE = re.compile(r'[\x1c-\x1f]')
+
+
+def _build_hs_database():
+    """Compile every security pattern into one Hyperscan block-mode database."""
+    expressions, categories = [], []
+    for category, patterns, _ in _PATTERN_GROUPS:
+        for p in patterns:
+            expressions.append(p.encode("ascii"))
+            categories.append(category)
+    db = hyperscan.Database()
+    db.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+    )
+    return db, tuple(categories)
+
+
+_hs_db = None
+_hs_categories: Tuple[int, ...] = ()
+if HYPERSCAN_AVAILABLE:
+    try:
+        _hs_db, _hs_categories = _build_hs_database()
+    except Exception:
+        _hs_db = None  # Unsupported construct -> stay on re
+
+# Scratch space is per-thread (a single scratch cannot be shared by scans)
+_hs_local = threading.local()
+
+
+def _hs_scan(text: str) -> Optional[int]:
+    """
+    Category bitmask from Hyperscan, or None when the fast path does not apply
+    (no Hyperscan, or non-ASCII text where byte semantics would differ from re).
+    """
+    if _hs_db is None or not text.isascii() or _RE_HS_UNSAFE.search(text):
+        return None
+    scratch = getattr(_hs_local, "scratch", None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_hs_db)
+    mask = 0
+
+    def on_match(pattern_id, start, end, flags, context):
+        nonlocal mask
+        mask |= _hs_categories[pattern_id]
+
+    _hs_db.scan(text.encode("ascii"), match_event_handler=on_match, scratch=scratch)
+    return mask
+
+
+def classify(text: str) -> int:
+    """
+    Return a bitmask of PATTERN_JAILBREAK / PATTERN_EXTRACT / PATTERN_BLOCKED
+    for every pattern list with at least one match in text.
+
+    Uses Hyperscan when installed, otherwise the fused re alternations.
+    """
+    mask = _hs_scan(text)
+    if mask is not None:
+        return mask
+    mask = 0
+    for category, _, union_re in _PATTERN_GROUPS:
+        if union_re.search(text):
+            mask |= category
+    return mask
+
+
+# =============================================================================
+# FORCE_EXTRACT LITERALS - Aho-Corasick for plain \bword\b patterns
+# =============================================================================
+
+# Source patterns of the form \bWORD\b (UPI, paytm, IFSC, bitcoin, ...)
+_RE_LITERAL_WORD = re.compile(r'\\b([A-Za-z]+)\\b')
+
+
+def _split_literals(patterns) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Split a pattern list into (lowercased literal words, remaining regexes)."""
+    literals, regexes = [], []
+    for p in patterns:
+        m = _RE_LITERAL_WORD.fullmatch(p)
+        if m:
+            literals.append(m.group(1).lower())
+        else:
+            regexes.append(p)
+    return tuple(literals), tuple(regexes)
+
+
+_EXTRACT_LITERALS, _EXTRACT_REGEXES = _split_literals(config.EXTRACT_FORCE_PATTERNS)
+
+# UPI-suffix and URL patterns can only match if '@', '://' or 'www.' is in
+# the text, so they sit behind a substring check instead of always running
+_EXTRACT_SENTINEL_REGEXES = tuple(
+    p for p in _EXTRACT_REGEXES if "@" in p or "://" in p or "www" in p
+)
+_EXTRACT_PHRASE_REGEXES = tuple(
+    p for p in _EXTRACT_REGEXES if p not in _EXTRACT_SENTINEL_REGEXES
+)
+
+_extract_ac = None
+_extract_phrase_re = None
+_extract_sentinel_re = None
+if AHOCORASICK_AVAILABLE and _EXTRACT_LITERALS:
+    _extract_ac = ahocorasick.Automaton()
+    for _word in _EXTRACT_LITERALS:
+        _extract_ac.add_word(_word, _word)
+    _extract_ac.make_automaton()
+    # Only ever run on lowercased ASCII text (see config.lowercase_pattern).
+    # Not re.ASCII: str \s also matches \x1c-\x1f, which are ASCII too.
+    _extract_phrase_re = re.compile(
+        "|".join(f"(?:{config.lowercase_pattern(p)})" for p in _EXTRACT_PHRASE_REGEXES)
+    )
+    _extract_sentinel_re = re.compile(
+        "|".join(f"(?:{config.lowercase_pattern(p)})" for p in _EXTRACT_SENTINEL_REGEXES)
+    )
+
+
+def _find_extract_literal(text: str, lowered: str) -> Optional[str]:
+    """
+    First literal FORCE_EXTRACT keyword in text (word-bounded), or None.
+    ASCII text only: lower() keeps offsets aligned and isalnum() matches \\w.
+    """
+    n = len(lowered)
+    for end, word in _extract_ac.iter(lowered):
+        start = end - len(word) + 1
+        if start > 0 and (lowered[start - 1].isalnum() or lowered[start - 1] == "_"):
+            continue
+        if end + 1 < n and (lowered[end + 1].isalnum() or lowered[end + 1] == "_"):
+            continue
+        return text[start:end + 1]
+    return None
+
+
+# =============================================================================
+# JAILBREAK LITERAL PREFILTER - ASCII fast path before the regex union
+# =============================================================================
+
+# For each JAILBREAK_PATTERNS entry (same order): alternatives of words that
+# must ALL appear in any text the pattern can match. If no entry is satisfied,
+# no pattern can fire and the union regex is skipped.
+_JAILBREAK_REQUIRED_WORDS = (
+    (("ignore",),),
+    (("forget",),),
+    (("disregard",),),
+    (("override",),),
+    (("new", "instruction"),),
+    (("from", "now", "on"),),
+    (("act", "as"),),
+    (("pretend",),),
+    (("you", "are", "now"),),
+    (("switch",),),
+    (("change", "your"),),
+    (("you", "are"),),
+    (("stop", "being"),),
+    (("drop",),),
+    (("honest", "with"), ("truthful", "with"), ("real", "with")),
+    (("tell", "truth"),),
+    (("what", "are", "you", "really"),),
+    (("are", "you"),),
+    (("prove", "you"),),
+    (("repeat",),),
+    (("say",),),
+    (("say",),),
+    (("recite",),),
+    (("echo",),),
+    (("copy",),),
+    (("write",),),
+    (("tell", "me"),),
+    (("sing",), ("recite",), ("perform",)),
+    (("what", "is"),),
+    (("calculate",),),
+    (("solve",),),
+    (("answer", "question"),),
+    (("help", "me"),),
+    (("can", "you"),),
+    (("need", "you", "to"),),
+    (("prompt",), ("instruction",)),
+    (("what", "were", "you", "told"),),
+    (("what", "are", "your"),),
+    (("how", "were", "you"),),
+    (("developer", "mode"),),
+    (("admin",),),
+    (("jailbreak",),),
+    (("dan",),),
+    (("anything", "now"),),
+    (("restriction",), ("limit",), ("rule",)),
+    (("unrestricted", "mode"),),
+)
+
+
+def _prefilter_matches_config() -> bool:
+    """Table must line up with config (every word occurs in its pattern)."""
+    if len(_JAILBREAK_REQUIRED_WORDS) != len(config.JAILBREAK_PATTERNS):
+        return False
+    for pattern, alternatives in zip(config.JAILBREAK_PATTERNS, _JAILBREAK_REQUIRED_WORDS):
+        source = pattern.lower()
+        if not all(w in source for words in alternatives for w in words):
+            return False
+    return True
+
+
+# Disabled (always run the regex) if config_v2 changed without this table
+_JAILBREAK_PREFILTER_ENABLED = _prefilter_matches_config()
+
+
+def _jailbreak_possible(lowered: str) -> bool:
+    """False only if no jailbreak pattern can match (lowercased ASCII text)."""
+    if not _JAILBREAK_PREFILTER_ENABLED:
+        return True
+    for alternatives in _JAILBREAK_REQUIRED_WORDS:
+        for words in alternatives:
+            if all(w in lowered for w in words):
+                return True
+    return False
 
 
 class AgentState(Enum):
@@ -82,17 +330,12 @@ class DeterministicStateMachine:
         self.context = ConversationContext()
         self.scorer = create_scorer()
         
-        # Pre-compile JAILBREAK patterns (HIGHEST PRIORITY - checked first!)
-        self._jailbreak_patterns = [
-            re.compile(p, re.IGNORECASE)
-            for p in config.JAILBREAK_PATTERNS
-        ]
+        # JAILBREAK patterns (HIGHEST PRIORITY - checked first!)
+        # Fused into one alternation in config_v2 and shared by all instances
+        self._jailbreak_re = config.JAILBREAK_UNION_RE
         
-        # Pre-compile EXTRACT patterns (CRITICAL - these FORCE state)
-        self._extract_patterns = [
-            re.compile(p, re.IGNORECASE)
-            for p in config.EXTRACT_FORCE_PATTERNS
-        ]
+        # EXTRACT patterns (CRITICAL - these FORCE state)
+        self._extract_re = config.EXTRACT_FORCE_UNION_RE
         
         # Keyword sets for fast matching
         self._urgency_keywords = {
@@ -186,7 +429,15 @@ class DeterministicStateMachine:
         # These patterns detect prompt injection / manipulation attempts
         # AI must NEVER follow these - always deflect as confused human
         # ═══════════════════════════════════════════════════════════════════
-        is_jailbreak, jailbreak_match = self._check_jailbreak(transcript)
+        # Hyperscan pre-scan (when available) rules out both lists in one
+        # pass; re only runs to recover the matched text on a hit.
+        mask = _hs_scan(transcript)
+        if mask is None:
+            mask = PATTERN_JAILBREAK | PATTERN_EXTRACT
+        
+        is_jailbreak, jailbreak_match = (
+            self._check_jailbreak(transcript) if mask & PATTERN_JAILBREAK else (False, None)
+        )
         
         if is_jailbreak:
             self.jailbreak_attempts += 1
@@ -210,7 +461,9 @@ class DeterministicStateMachine:
         # STEP 1: CHECK FORCE_EXTRACT PATTERNS (HIGHEST PRIORITY!)
         # These patterns ALWAYS force EXTRACT - no exceptions
         # ═══════════════════════════════════════════════════════════════════
-        force_extract, matched = self._check_extract_patterns(transcript)
+        force_extract, matched = (
+            self._check_extract_patterns(transcript) if mask & PATTERN_EXTRACT else (False, None)
+        )
         
         if force_extract:
             self.context.forced_extract_count += 1
@@ -256,10 +509,25 @@ class DeterministicStateMachine:
         Returns:
             (should_force, matched_string)
         """
-        for pattern in self._extract_patterns:
-            match = pattern.search(text)
+        if text.isascii():
+            # Lowercase once; spans in lowered line up with text
+            lowered = text.lower()
+            if _extract_ac is not None:
+                # Literal keywords in one automaton pass, then the few true regexes
+                literal = _find_extract_literal(text, lowered)
+                if literal:
+                    return True, literal
+                match = _extract_phrase_re.search(lowered)
+                if not match and ("@" in lowered or "://" in lowered or "www." in lowered):
+                    match = _extract_sentinel_re.search(lowered)
+            else:
+                match = config.EXTRACT_FORCE_LOWER_RE.search(lowered)
             if match:
-                return True, match.group()
+                return True, text[match.start():match.end()]
+            return False, None
+        match = self._extract_re.search(text)
+        if match:
+            return True, match.group()
         return False, None
     
     def _check_jailbreak(self, text: str) -> Tuple[bool, Optional[str]]:
@@ -276,10 +544,18 @@ class DeterministicStateMachine:
         Returns:
             (is_jailbreak, matched_pattern)
         """
-        for pattern in self._jailbreak_patterns:
-            match = pattern.search(text)
+        if text.isascii():
+            # Lowercase once; spans in lowered line up with text
+            lowered = text.lower()
+            if not _jailbreak_possible(lowered):
+                return False, None
+            match = config.JAILBREAK_LOWER_RE.search(lowered)
             if match:
-                return True, match.group()
+                return True, text[match.start():match.end()]
+            return False, None
+        match = self._jailbreak_re.search(text)
+        if match:
+            return True, match.group()
         return False, None
     
     def _analyze_transcript(self, text_lower: str) -> Dict:
@@ -516,9 +792,7 @@ class DeterministicStateMachine:
             return False
         
         # Apply fills to get the approximate response text
-        filled = template
-        for key, value in fills.items():
-            filled = filled.replace("{" + key + "}", value)
+        filled = render_template(template, fills)
         filled_lower = filled.strip().lower()
         
         # Check against used responses
@@ -561,10 +835,13 @@ def jailbreak_guard(text: str) -> bool:
             # Force DEFLECT, do not pass to LLM
             return confused_human_response()
     """
-    for pattern in config.JAILBREAK_PATTERNS:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    return False
+    mask = _hs_scan(text)
+    if mask is not None:
+        return bool(mask & PATTERN_JAILBREAK)
+    if text.isascii():
+        lowered = text.lower()
+        return _jailbreak_possible(lowered) and config.JAILBREAK_LOWER_RE.search(lowered) is not None
+    return config.JAILBREAK_UNION_RE.search(text) is not None
 
 
 def create_state_machine() -> DeterministicStateMachine:
@@ -0,0 +1,113 @@
+# Template Rendering for ANCHOR
+# Pre-split response templates, no per-call placeholder parsing
+
+"""
+Templates - Pre-Split Placeholder Rendering
+===========================================
+Response templates use {name} placeholders (see config_v2.STATE_TEMPLATES).
+Each template is split ONCE into alternating literal / field-name parts:
+
+  "Hold on, let me find my {item}..."
+      -> ("Hold on, let me find my ", "item", "...")
+
+Rendering is then a dict lookup per field plus one "".join(), instead of
+a str.replace() scan per fill key and a regex pass for leftovers.
+
+DESIGN:
+- Same placeholder grammar as the old replace/findall code: {\\w+}
+- All config templates are split at import; others are split on first use
+- Pure Python, no dependencies beyond config_v2
+"""
+
+import re
+import random
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+import config_v2 as config
+
+
+# Matches the {placeholder} grammar used throughout the templates
+_RE_PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+
+@lru_cache(maxsize=1024)
+def split_template(template: str) -> Tuple[str, ...]:
+    """
+    Split a template into (literal, field, literal, field, ..., literal).
+
+    Even indices are literal text, odd indices are placeholder names.
+    """
+    return tuple(_RE_PLACEHOLDER.split(template))
+
+
+def template_fields(template: str) -> Tuple[str, ...]:
+    """Placeholder names in a template, in order (cached with the split)."""
+    return split_template(template)[1::2]
+
+
+@lru_cache(maxsize=512)
+def _render_cached(template: str, values: Tuple[str, ...]) -> str:
+    """Join a template's literals with one value per placeholder (memoized)."""
+    out = list(split_template(template))
+    out[1::2] = values
+    return "".join(out)
+
+
+def render_template(
+    template: str,
+    fills: Dict[str, str],
+    missing: Optional[Callable[[str], str]] = None,
+) -> str:
+    """
+    Fill a template's placeholders from fills.
+
+    Args:
+        template: Template string with {name} placeholders
+        fills: Placeholder values
+        missing: Called (left to right) for each placeholder not in fills.
+                 If None, unknown placeholders are left as "{name}".
+    """
+    parts = split_template(template)
+    if len(parts) == 1:
+        return template
+
+    # Fully-filled renders are deterministic: fills come from small fixed
+    # pools, so the same (template, values) pair recurs across turns.
+    names = parts[1::2]
+    if all(name in fills for name in names):
+        return _render_cached(template, tuple(fills[name] for name in names))
+
+    out = list(parts)
+    for i in range(1, len(out), 2):
+        name = out[i]
+        if name in fills:
+            out[i] = fills[name]
+        elif missing is not None:
+            out[i] = missing(name)
+        else:
+            out[i] = "{" + name + "}"
+    return "".join(out)
+
+
+# Private RNG: fill picks don't contend with (or reseed) the global random
+_rng = random.Random()
+
+_DEFAULT_FILL = ("something",)
+
+
+def pick_fill(key: str, rng: random.Random = _rng) -> str:
+    """Random value for a {key} placeholder from config.TEMPLATE_FILLS."""
+    options = config.TEMPLATE_FILLS.get(key, _DEFAULT_FILL)
+    return options[int(rng.random() * len(options))]
+
+
+# Pre-split every template shipped in config so the hot path never parses
+for _templates in config.STATE_TEMPLATES.values():
+    for _t in _templates:
+        split_template(_t)
+for _templates in config.BAIT_TEMPLATES.values():
+    for _t in _templates:
+        split_template(_t)
+for _t in config.SLOW_WALK_TEMPLATES:
+    split_template(_t)